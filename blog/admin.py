@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import APIKey, Comment, Post
+from .models import APIKey, Comment, Post, TagStat, ThumbnailJob
 
 
 @admin.register(Post)
@@ -11,6 +11,20 @@ class PostAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
 
 
+@admin.register(TagStat)
+class TagStatAdmin(admin.ModelAdmin):
+    list_display = ('tag', 'post_count', 'last_used')
+    search_fields = ('tag',)
+    readonly_fields = ('tag', 'post_count', 'last_used')
+
+
+@admin.register(ThumbnailJob)
+class ThumbnailJobAdmin(admin.ModelAdmin):
+    list_display = ('post', 'status', 'attempts', 'duration_ms', 'run_after', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('post', 'source_url', 'attempts', 'last_error', 'locked_at', 'created_at', 'finished_at', 'duration_ms')
+
+
 @admin.register(APIKey)
 class APIKeyAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'scope', 'masked_key', 'is_active', 'is_expired', 'created_at', 'last_used')
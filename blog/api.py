@@ -1,13 +1,20 @@
+import base64
 import json
 import os
+from datetime import datetime, timezone as dt_timezone
 
+from django.core.paginator import EmptyPage
+from django.db.models import Q
 from django.http import JsonResponse
-from django.db import connection
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_GET, require_POST
+from django.views.decorators.http import condition, require_GET, require_POST
 
+from .conditional import api_post_detail_etag, api_post_list_etag, post_last_modified
 from .decorators import api_auth_required
 from .models import Comment, Post
+from .pagination import HasNextPaginator, get_count_strategy, make_paginator
+from .tag_utils import filter_posts_by_tags, get_related_tags, get_tag_facets
 from .utils import normalize_tag, process_uploaded_md, process_uploaded_zip
 
 
@@ -38,13 +45,46 @@ def api_upload_post(request):
     return JsonResponse({'slug': slug, 'url': f'/post/{slug}/'})
 
 
+def _encode_cursor(post):
+    """다음 페이지의 시작점(created_at, id)을 불투명한 문자열로 만듭니다."""
+    raw = json.dumps([post.created_at.isoformat(), post.pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+# id 컬럼(BigAutoField)이 담을 수 있는 최댓값
+_MAX_POST_ID = 2 ** 63 - 1
+
+
+def _decode_cursor(cursor):
+    """_encode_cursor()의 역변환입니다. 형식이 잘못되면 ValueError를 발생시킵니다.
+
+    DB 쿼리에서 터지지 않도록 id는 bigint 범위의 양의 정수, 시각은 UTC로 바꿀 수 있는
+    timezone-aware 값만 받습니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, post_id = json.loads(raw)
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is None:
+            raise ValueError('naive datetime')
+        created_at = created_at.astimezone(dt_timezone.utc)
+        if type(post_id) is not int or not 0 < post_id <= _MAX_POST_ID:
+            raise ValueError('post id out of range')
+        return created_at, post_id
+    except (TypeError, ValueError, OverflowError, UnicodeDecodeError) as exc:
+        raise ValueError('invalid cursor') from exc
+
+
 @csrf_exempt
 @api_auth_required(scope='read')
 @require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=api_post_list_etag)
 def api_post_list(request):
     tag = normalize_tag(request.GET.get('tag', ''))
     page = request.GET.get('page', '1')
     per_page = request.GET.get('per_page', '20')
+    cursor = request.GET.get('cursor')
 
     try:
         page = max(1, int(page))
@@ -54,22 +94,45 @@ def api_post_list(request):
 
     posts_qs = Post.objects.all()
     if tag:
-        if connection.vendor == 'postgresql':
-            posts_qs = posts_qs.filter(tags__contains=[tag])
-        else:
-            posts_qs = [
-                p for p in posts_qs
-                if tag in {normalize_tag(raw) for raw in p.tags}
-            ]
-
-    posts = list(posts_qs)
-
-    total = len(posts)
-    start = (page - 1) * per_page
-    end = start + per_page
-    page_posts = posts[start:end]
+        posts_qs = filter_posts_by_tags(posts_qs, [tag])
+    list_qs = (
+        posts_qs
+        .only('id', 'title', 'slug', 'created_at', 'summary', 'tags', 'thumbnail_url')
+        .order_by('-created_at', '-id')
+    )
 
-    return JsonResponse({
+    if cursor is not None:
+        # 커서 모드: (created_at, id) 키셋 조건으로 이어서 읽으므로 깊은 페이지도 첫 페이지와 비용이 같음
+        if cursor:
+            try:
+                created_at, post_id = _decode_cursor(cursor)
+            except ValueError:
+                return JsonResponse({'error': '잘못된 cursor 값입니다.'}, status=400)
+            list_qs = list_qs.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=post_id)
+            )
+        page_posts = list(list_qs[:per_page + 1])
+        has_next = len(page_posts) > per_page
+        page_posts = page_posts[:per_page]
+        next_cursor = _encode_cursor(page_posts[-1]) if has_next else None
+        pagination = {'per_page': per_page}
+    else:
+        paginator = make_paginator(
+            list_qs, per_page, get_count_strategy('api_post_list'), count_key=('tag', tag),
+        )
+        try:
+            page_obj = paginator.page(page)
+        except EmptyPage:
+            page_posts, has_next = [], False
+        else:
+            page_posts, has_next = page_obj.object_list, page_obj.has_next()
+        pagination = {'page': page, 'per_page': per_page, 'has_next': has_next}
+        if not isinstance(paginator, HasNextPaginator):
+            total = paginator.count
+            pagination['total'] = total
+            pagination['total_pages'] = (total + per_page - 1) // per_page if total else 0
+
+    response = {
         'posts': [
             {
                 'title': p.title,
@@ -81,18 +144,28 @@ def api_post_list(request):
             }
             for p in page_posts
         ],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'total_pages': (total + per_page - 1) // per_page if total else 0,
-        },
-    })
+        'pagination': pagination,
+    }
+    if cursor is not None:
+        response['next_cursor'] = next_cursor
+    if request.GET.get('facets') in ('1', 'true'):
+        response['facets'] = [
+            {'tag': facet_tag, 'count': count}
+            for facet_tag, count in get_tag_facets(posts_qs)
+        ]
+    if tag:
+        response['related_tags'] = [
+            {'tag': related_tag, 'count': count}
+            for related_tag, count in get_related_tags([tag])
+        ]
+    return JsonResponse(response)
 
 
 @csrf_exempt
 @api_auth_required(scope='read')
 @require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=api_post_detail_etag, last_modified_func=post_last_modified)
 def api_post_detail(request, slug):
     try:
         post = Post.objects.get(slug=slug)
@@ -108,6 +181,7 @@ def api_post_detail(request, slug):
         'summary': post.summary,
         'tags': post.tags,
         'body': post.body_html,
+        'meta': post.doc_meta,
         'comments': [
             {
                 'id': c.pk,
@@ -0,0 +1,53 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# 게시글 쓰기(저장/삭제)마다 세대가 바뀌는 네임스페이스 — 검색 결과 등 게시글 파생 캐시용
+POST_CACHE_NAMESPACE = 'posts'
+
+
+def _version_key(namespace):
+    return f'blog:version:{namespace}'
+
+
+def get_cache_version(namespace):
+    """네임스페이스별 캐시 세대 번호를 반환합니다. 없으면 새로 발급합니다."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # 키가 만료/축출된 경우 예전 세대와 겹치지 않도록 시각 기반 값으로 시작
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_cache_versions(namespaces):
+    """여러 네임스페이스의 현재 세대 번호를 한 번에 읽습니다. 발급되지 않은 세대는 None입니다."""
+    keys = {namespace: _version_key(namespace) for namespace in namespaces}
+    found = cache.get_many(list(keys.values()))
+    return {namespace: found.get(key) for namespace, key in keys.items()}
+
+
+def bump_cache_version(namespace):
+    """세대 번호를 올려 해당 네임스페이스의 기존 캐시를 모두 무효화합니다."""
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_on_commit(namespace):
+    """즉시 무효화하고, 트랜잭션 커밋 직후 한 번 더 무효화합니다.
+
+    커밋 전에 다른 워커가 이전 데이터로 캐시를 다시 채우는 경우를 막기 위함입니다.
+    """
+    bump_cache_version(namespace)
+    transaction.on_commit(lambda: bump_cache_version(namespace))
+
+
+def versioned_key(namespace, *parts):
+    """현재 세대 번호가 포함된 캐시 키를 만듭니다."""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'blog:{namespace}:{get_cache_version(namespace)}:{suffix}'
@@ -0,0 +1,69 @@
+import hashlib
+
+from django.db.models import Count, Max
+
+from .cache_utils import POST_CACHE_NAMESPACE, get_cache_version
+from .models import Post
+from .page_cache import normalized_query_string
+from .tag_utils import TAG_CACHE_NAMESPACE
+
+
+def _digest(*parts):
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+
+def get_post_freshness(request, slug):
+    """본문을 읽기 전에 (게시글 id, 수정 시각, 마지막 댓글 시각, 댓글 수)만 조회합니다.
+
+    ETag/Last-Modified 함수가 같은 요청에서 여러 번 부르므로 결과를 요청에 보관하며,
+    글이 없으면 None입니다.
+    """
+    cached = getattr(request, '_post_freshness', None)
+    if cached is not None and cached[0] == slug:
+        return cached[1]
+    row = (
+        Post.objects.filter(slug=slug)
+        .order_by()
+        .annotate(last_comment_at=Max('comments__created_at'), comment_count=Count('comments'))
+        .values_list('pk', 'updated_at', 'last_comment_at', 'comment_count')
+        .first()
+    )
+    request._post_freshness = (slug, row)
+    return row
+
+
+def post_last_modified(request, slug):
+    """글 수정 시각과 마지막 댓글 시각 중 늦은 쪽을 Last-Modified로 씁니다.
+
+    사용자와 무관한 JSON 상세 응답에만 씁니다. HTML 상세는 로그인 사용자와 내비게이션
+    태그에 따라 달라지므로 ETag만 씁니다.
+    """
+    row = get_post_freshness(request, slug)
+    if row is None:
+        return None
+    _, updated_at, last_comment_at, _ = row
+    return max(updated_at, last_comment_at) if last_comment_at else updated_at
+
+
+def api_post_detail_etag(request, slug):
+    """글 수정 시각과 댓글 변경(추가 시각, 개수)으로 만든 JSON 상세 응답의 ETag입니다."""
+    row = get_post_freshness(request, slug)
+    if row is None:
+        return None
+    return _digest('api', *row)
+
+
+def post_detail_etag(request, slug):
+    """HTML 상세 페이지의 ETag입니다.
+
+    로그인 사용자별 화면(댓글 폼, 본인 댓글 삭제 버튼)과 내비게이션 태그 목록도 반영합니다.
+    """
+    row = get_post_freshness(request, slug)
+    if row is None:
+        return None
+    return _digest('html', *row, request.user.pk or '', get_cache_version(TAG_CACHE_NAMESPACE))
+
+
+def api_post_list_etag(request):
+    """게시글 쓰기마다 바뀌는 posts 캐시 세대와 쿼리 문자열로 만든 목록 응답의 ETag입니다. (DB 조회 없음)"""
+    return _digest('api-list', get_cache_version(POST_CACHE_NAMESPACE), normalized_query_string(request))
@@ -1,11 +1,24 @@
-from .tag_utils import get_sorted_tag_counts
+import functools
+
+from .tag_utils import get_cached_tag_counts
+
+NAVBAR_TOP_TAG_COUNT = 8
 
 
 def navbar_tags(request):
-    all_tag_items = get_sorted_tag_counts()
+    """태그 목록은 템플릿이 실제로 참조할 때에만 공유 캐시에서 불러옵니다.
+
+    Django 템플릿은 callable 변수를 평가 시점에 호출하므로, 태그를 쓰지 않는
+    페이지(로그인, API 가이드 등)에서는 캐시/DB 조회가 일어나지 않습니다.
+    """
+    @functools.lru_cache(maxsize=None)
+    def all_tag_items():
+        return get_cached_tag_counts()
+
     return {
-        'navbar_top_tags': all_tag_items[:8],
+        'navbar_top_tags': lambda: all_tag_items()[:NAVBAR_TOP_TAG_COUNT],
         'navbar_all_tag_items': all_tag_items,
-        'navbar_all_tags': [tag for tag, _ in all_tag_items],
+        'navbar_all_tags': lambda: [tag for tag, _ in all_tag_items()],
+        'navbar_has_more_tags': lambda: len(all_tag_items()) > NAVBAR_TOP_TAG_COUNT,
         'navbar_current_tag': request.GET.get('tag', '').strip(),
     }
@@ -0,0 +1,34 @@
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+POST_CARD_TEMPLATE = 'blog/_post_card.html'
+# 키에 updated_at이 들어가 글이 바뀌면 자연히 새 키를 쓰므로 별도 무효화 없이 오래 보관
+POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _post_card_key(post, variant):
+    return f'blog:card:{post.pk}:{int(post.updated_at.timestamp() * 1_000_000)}:{variant}'
+
+
+def render_post_cards(posts, context):
+    """글 목록 카드 HTML을 (글 id, updated_at, 카드 컨텍스트)별로 캐시해 순서대로 반환합니다.
+
+    한 페이지의 카드는 get_many 한 번으로 읽고, 없는 카드만 렌더링해 set_many로 채웁니다.
+    context는 카드가 글 외에 참조하는 값(is_staff, current_query_expr, per_page)입니다.
+    """
+    variant = hashlib.sha256(repr(sorted(context.items())).encode()).hexdigest()[:16]
+    keys = [_post_card_key(post, variant) for post in posts]
+    cached = cache.get_many(keys)
+    rendered = {}
+    cards = []
+    for post, key in zip(posts, keys):
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = render_to_string(POST_CARD_TEMPLATE, {**context, 'post': post})
+        cards.append(mark_safe(html))
+    if rendered:
+        cache.set_many(rendered, POST_CARD_CACHE_TIMEOUT)
+    return cards
@@ -0,0 +1,70 @@
+import time
+
+import bleach
+import markdown
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.rendering import (
+    ALLOWED_ATTRIBUTES, ALLOWED_PROTOCOLS, ALLOWED_TAGS, MARKDOWN_EXTENSION_CONFIGS, MARKDOWN_EXTENSIONS, renderer,
+)
+
+SAMPLE_DOCUMENT = '''# 샘플 문서
+
+Django로 **검색**을 구현하는 과정을 정리합니다. [링크](https://example.com)
+
+## 코드
+
+```python
+def hello(name):
+    return f'hello {name}'
+```
+
+| 항목 | 설명 |
+|------|------|
+| 파서 | markdown |
+| 정제 | bleach |
+
+- 목록 하나
+- 목록 둘
+
+> 인용문 <script>alert(1)</script>
+'''
+
+
+def render_per_call(body_md):
+    """렌더링 엔진 도입 전 방식: 호출마다 파서와 정제 설정을 새로 만듭니다. (비교 기준)"""
+    html = markdown.markdown(
+        body_md, extensions=MARKDOWN_EXTENSIONS, extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, protocols=ALLOWED_PROTOCOLS)
+
+
+class Command(BaseCommand):
+    help = '렌더링 엔진과 호출마다 파서를 만드는 기존 방식의 처리량(문서/초)을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='사용할 최근 게시글 수 (없으면 내장 샘플 문서)')
+        parser.add_argument('--rounds', type=int, default=5, help='문서 집합을 반복 렌더링할 횟수')
+
+    def handle(self, *args, **options):
+        documents = list(
+            Post.objects.exclude(body_md='').values_list('body_md', flat=True)[:max(1, options['limit'])]
+        ) or [SAMPLE_DOCUMENT]
+        rounds = max(1, options['rounds'])
+
+        results = {}
+        for name, render in (('기존(호출마다 생성)', render_per_call), ('렌더링 엔진', renderer.render)):
+            render(documents[0])  # 첫 호출의 import/파서 생성 비용은 제외
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for document in documents:
+                    render(document)
+            elapsed = time.perf_counter() - started
+            results[name] = len(documents) * rounds / elapsed
+            self.stdout.write(f'{name}: {results[name]:.1f}문서/초 ({elapsed:.2f}초)')
+
+        baseline, engine = results.values()
+        self.stdout.write(self.style.SUCCESS(
+            f'문서 {len(documents)}건 × {rounds}회, 렌더링 엔진이 {engine / baseline:.2f}배 빠릅니다.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = '검색 토큰(search_tokens)과 검색 색인(PostgreSQL search_vector 또는 SQLite FTS5)을 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        total = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'게시글 {total}건을 검색 색인에 반영했습니다.'))
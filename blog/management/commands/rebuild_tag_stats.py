@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.tag_utils import rebuild_tag_stats
+
+
+class Command(BaseCommand):
+    help = '게시글 태그를 전수 집계해 PostTag/TagStat/TagCooccurrence 테이블을 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        total = rebuild_tag_stats()
+        self.stdout.write(self.style.SUCCESS(f'태그 통계 {total}건을 재구성했습니다.'))
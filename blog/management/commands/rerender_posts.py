@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.cache_utils import POST_CACHE_NAMESPACE, invalidate_on_commit
+from blog.models import Post
+from blog.page_cache import post_surrogate, purge_page_surrogates
+from blog.rendering import render_markdown_document, renderer
+from blog.tag_utils import filter_posts_by_tags
+from blog.utils import normalize_tag
+
+RENDERER_VERSION = renderer.version
+
+
+def _parse_date(value, option):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'{option}는 YYYY-MM-DD 형식이어야 합니다: {value}')
+
+
+class Command(BaseCommand):
+    help = (
+        '저장된 body_html과 doc_meta를 현재 렌더러(허용 태그/마크다운 확장)로 다시 만듭니다. '
+        '게시글을 묶음 단위로 읽어 프로세스 풀에서 렌더링하고 bulk_update로 저장합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tag', help='이 태그가 달린 글만 처리')
+        parser.add_argument('--since', help='작성일이 이 날짜(YYYY-MM-DD) 이후인 글만 처리')
+        parser.add_argument('--until', help='작성일이 이 날짜(YYYY-MM-DD) 이전인 글만 처리')
+        parser.add_argument(
+            '--stale', action='store_true',
+            help=f'현재 렌더러 버전({RENDERER_VERSION})으로 렌더링되지 않은 글만 처리',
+        )
+        parser.add_argument('--chunk-size', type=int, default=200, help='한 번에 읽고 저장할 글 수 (기본 200)')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='렌더링 프로세스 수 (기본 CPU 수, 1이면 현재 프로세스에서 처리)',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(body_md='')
+        if options['tag']:
+            posts = filter_posts_by_tags(posts, [normalize_tag(options['tag'])])
+        if options['since']:
+            posts = posts.filter(created_at__date__gte=_parse_date(options['since'], '--since'))
+        if options['until']:
+            posts = posts.filter(created_at__date__lte=_parse_date(options['until'], '--until'))
+        if options['stale']:
+            posts = posts.exclude(body_html_version=RENDERER_VERSION)
+
+        chunk_size = max(1, options['chunk_size'])
+        workers = max(1, options['workers'])
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        started = time.monotonic()
+        total = changed = 0
+        last_pk = 0
+        try:
+            while True:
+                # pk 키셋으로 묶음을 읽어 전체 본문을 한꺼번에 메모리에 올리지 않음
+                chunk = list(
+                    posts.filter(pk__gt=last_pk).order_by('pk').only('id', 'body_md', 'body_html', 'doc_meta')[:chunk_size]
+                )
+                if not chunk:
+                    break
+                last_pk = chunk[-1].pk
+                bodies = [post.body_md for post in chunk]
+                if executor is None:
+                    rendered = map(render_markdown_document, bodies)
+                else:
+                    rendered = executor.map(render_markdown_document, bodies, chunksize=max(1, len(bodies) // workers))
+                changed += self._save_chunk(chunk, rendered)
+                total += len(chunk)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'게시글 {total}건을 다시 렌더링했습니다. (변경 {changed}건, {elapsed:.1f}초, {rate:.1f}건/초)'
+        ))
+
+    def _save_chunk(self, chunk, rendered):
+        now = timezone.now()
+        updated, unchanged_ids = [], []
+        for post, (body_html, doc_meta) in zip(chunk, rendered):
+            if post.body_html == body_html and post.doc_meta == doc_meta:
+                unchanged_ids.append(post.pk)
+                continue
+            post.body_html = body_html
+            post.doc_meta = doc_meta
+            post.body_html_version = RENDERER_VERSION
+            # 카드 조각 캐시와 ETag가 새 HTML을 반영하도록 수정 시각도 갱신
+            post.updated_at = now
+            updated.append(post)
+
+        if unchanged_ids:
+            Post.objects.filter(pk__in=unchanged_ids).exclude(
+                body_html_version=RENDERER_VERSION,
+            ).update(body_html_version=RENDERER_VERSION)
+        if updated:
+            Post.objects.bulk_update(updated, ['body_html', 'doc_meta', 'body_html_version', 'updated_at'])
+            invalidate_on_commit(POST_CACHE_NAMESPACE)
+            purge_page_surrogates(*(post_surrogate(post.pk) for post in updated))
+        return len(updated)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.query_budget import get_degradation_counts
+
+
+class Command(BaseCommand):
+    help = '검색 시간 예산 초과로 축소 응답한 횟수를 종류별로 출력합니다.'
+
+    def handle(self, *args, **options):
+        for kind, count in get_degradation_counts().items():
+            self.stdout.write(f'{kind}: {count}')
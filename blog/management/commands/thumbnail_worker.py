@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.thumbnails import get_thumbnail_job_stats, process_thumbnail_jobs
+
+
+class Command(BaseCommand):
+    help = '썸네일 작업 큐(ThumbnailJob)를 처리합니다. 기본은 새 작업을 계속 기다리는 상주 모드입니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업만 처리하고 종료')
+        parser.add_argument('--sleep', type=float, default=2.0, help='작업이 없을 때 다시 확인하기까지 대기(초)')
+        parser.add_argument('--stats', action='store_true', help='작업 상태별 건수와 처리 시간 통계만 출력')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self._write_stats()
+            return
+
+        while True:
+            succeeded, failed = process_thumbnail_jobs()
+            if succeeded or failed:
+                self.stdout.write(f'썸네일 작업 완료 {succeeded}건, 실패 {failed}건')
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+
+    def _write_stats(self):
+        stats = get_thumbnail_job_stats()
+        for status, count in stats['counts'].items():
+            self.stdout.write(f'{status}: {count}')
+        if stats['avg_ms'] is not None:
+            self.stdout.write(f"처리 시간: 평균 {stats['avg_ms']:.0f}ms, 최대 {stats['max_ms']}ms")
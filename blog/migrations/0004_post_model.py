@@ -49,6 +49,7 @@ def _extract_thumbnail(body_md):
 
 
 def _render_md(body_md):
+    # 마이그레이션 시점의 렌더링을 고정 (현재 렌더러로 다시 만들려면 rerender_posts --stale)
     try:
         import markdown
         import bleach
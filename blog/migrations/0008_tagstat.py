@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+def populate_tag_stats(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    TagStat = apps.get_model('blog', 'TagStat')
+
+    tag_stats = {}
+    for post in Post.objects.only('id', 'tags', 'updated_at').iterator():
+        raw_tags = post.tags if isinstance(post.tags, list) else []
+        for tag in {str(raw).strip().lower() for raw in raw_tags}:
+            if not tag:
+                continue
+            count, last_used = tag_stats.get(tag, (0, None))
+            if last_used is None or post.updated_at > last_used:
+                last_used = post.updated_at
+            tag_stats[tag] = (count + 1, last_used)
+
+    TagStat.objects.bulk_create([
+        TagStat(tag=tag, post_count=count, last_used=last_used)
+        for tag, (count, last_used) in tag_stats.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_add_search_document_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=300, unique=True)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-post_count', 'tag'],
+                'indexes': [models.Index(fields=['-post_count', 'tag'], name='blog_tagstat_count_idx')],
+            },
+        ),
+        migrations.RunPython(populate_tag_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_post_tags(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostTag = apps.get_model('blog', 'PostTag')
+
+    links = []
+    for post in Post.objects.only('id', 'tags').iterator():
+        raw_tags = post.tags if isinstance(post.tags, list) else []
+        for tag in {str(raw).strip().lower() for raw in raw_tags}:
+            if tag:
+                links.append(PostTag(post_id=post.pk, tag=tag))
+        if len(links) >= 1000:
+            PostTag.objects.bulk_create(links)
+            links = []
+    PostTag.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_tagstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=300)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', 'post'], name='blog_posttag_tag_post_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='posttag',
+            constraint=models.UniqueConstraint(fields=('post', 'tag'), name='blog_posttag_post_tag_uniq'),
+        ),
+        migrations.RunPython(populate_post_tags, migrations.RunPython.noop),
+    ]
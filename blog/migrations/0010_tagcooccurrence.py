@@ -0,0 +1,50 @@
+from collections import Counter
+from itertools import permutations
+
+from django.db import migrations, models
+
+
+def populate_tag_cooccurrence(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    TagCooccurrence = apps.get_model('blog', 'TagCooccurrence')
+
+    pair_counts = Counter()
+    for post in Post.objects.only('id', 'tags').iterator():
+        raw_tags = post.tags if isinstance(post.tags, list) else []
+        tags = {str(raw).strip().lower() for raw in raw_tags} - {''}
+        pair_counts.update(permutations(sorted(tags), 2))
+
+    TagCooccurrence.objects.bulk_create(
+        [
+            TagCooccurrence(tag=tag, related_tag=related_tag, count=count)
+            for (tag, related_tag), count in pair_counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_posttag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=300)),
+                ('related_tag', models.CharField(max_length=300)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', '-count'], name='blog_tagcooc_tag_count_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tagcooccurrence',
+            constraint=models.UniqueConstraint(fields=('tag', 'related_tag'), name='blog_tagcooc_pair_uniq'),
+        ),
+        migrations.RunPython(populate_tag_cooccurrence, migrations.RunPython.noop),
+    ]
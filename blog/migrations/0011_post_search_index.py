@@ -0,0 +1,49 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import blog.models
+
+
+def create_sqlite_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts '
+        'USING fts5(search_document, tokenize="unicode61")'
+    )
+    schema_editor.execute('DELETE FROM blog_post_fts')
+    schema_editor.execute(
+        'INSERT INTO blog_post_fts(rowid, search_document) '
+        'SELECT id, search_document FROM blog_post'
+    )
+
+
+def drop_sqlite_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_tagcooccurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blog.post')),
+                ('search_document', blog.models.FullTextDocumentField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_sqlite_fts_index, drop_sqlite_fts_index),
+    ]
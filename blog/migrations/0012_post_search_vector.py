@@ -0,0 +1,55 @@
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='simple')
+        + SearchVector('summary', weight='B', config='simple')
+        + SearchVector('body_md', weight='C', config='simple')
+    ))
+
+
+def create_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS blog_post_search_vector_idx '
+        'ON blog_post USING GIN (search_vector);'
+    )
+    # 질의가 저장된 search_vector를 쓰므로 0007의 함수 기반 색인은 더 이상 사용되지 않음
+    schema_editor.execute('DROP INDEX IF EXISTS blog_post_search_document_fts_idx;')
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS blog_post_search_document_fts_idx "
+        "ON blog_post USING GIN (to_tsvector('simple', search_document));"
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS blog_post_search_vector_idx;')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+        migrations.RunPython(create_search_vector_index, drop_search_vector_index),
+    ]
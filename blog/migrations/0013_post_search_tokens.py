@@ -0,0 +1,92 @@
+import re
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import TextField, Value
+
+# 마이그레이션 시점의 토큰화 규칙을 고정 (앱의 tokenize_search_text가 바뀌어도 결과가 같도록)
+_HANGUL_CHARS = 'ㄱ-ㅎㅏ-ㅣ가-힣'
+_SEARCH_TOKEN_RE = re.compile(rf'[{_HANGUL_CHARS}]+|[^\W{_HANGUL_CHARS}]+')
+_HANGUL_RUN_RE = re.compile(rf'[{_HANGUL_CHARS}]+')
+
+
+def _tokenize(text):
+    tokens = []
+    for match in _SEARCH_TOKEN_RE.finditer(str(text or '').lower()):
+        run = match.group()
+        if len(run) > 1 and _HANGUL_RUN_RE.fullmatch(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _tokens(text):
+    return ' '.join(_tokenize(text))
+
+
+def populate_search_tokens(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    is_postgres = schema_editor.connection.vendor == 'postgresql'
+    posts = Post.objects.only('id', 'title', 'summary', 'body_md', 'search_document')
+    for post in posts.iterator():
+        changes = {'search_tokens': _tokens(post.search_document)}
+        if is_postgres:
+            changes['search_vector'] = (
+                SearchVector(Value(_tokens(post.title), output_field=TextField()), weight='A', config='simple')
+                + SearchVector(Value(_tokens(post.summary), output_field=TextField()), weight='B', config='simple')
+                + SearchVector(Value(_tokens(post.body_md), output_field=TextField()), weight='C', config='simple')
+            )
+        Post.objects.filter(pk=post.pk).update(**changes)
+
+
+def recreate_sqlite_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE blog_post_fts '
+        'USING fts5(search_tokens, tokenize="unicode61")'
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_post_fts(rowid, search_tokens) '
+        'SELECT id, search_tokens FROM blog_post'
+    )
+
+
+def restore_sqlite_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE blog_post_fts '
+        'USING fts5(search_document, tokenize="unicode61")'
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_post_fts(rowid, search_document) '
+        'SELECT id, search_document FROM blog_post'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_tokens',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_tokens, migrations.RunPython.noop),
+        migrations.RenameField(
+            model_name='postsearchindex',
+            old_name='search_document',
+            new_name='search_tokens',
+        ),
+        migrations.RunPython(recreate_sqlite_fts_index, restore_sqlite_fts_index),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_body_html_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='doc_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,59 @@
+import re
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+
+# 마이그레이션 시점의 토큰화 규칙을 고정 (한글 구간 bigram + 마지막 글자 unigram)
+_HANGUL_CHARS = 'ㄱ-ㅎㅏ-ㅣ가-힣'
+_SEARCH_TOKEN_RE = re.compile(rf'[{_HANGUL_CHARS}]+|[^\W{_HANGUL_CHARS}]+')
+_HANGUL_RUN_RE = re.compile(rf'[{_HANGUL_CHARS}]+')
+
+
+def _tokenize(text):
+    tokens = []
+    for match in _SEARCH_TOKEN_RE.finditer(str(text or '').lower()):
+        run = match.group()
+        if len(run) > 1 and _HANGUL_RUN_RE.fullmatch(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _tokens(text):
+    return ' '.join(_tokenize(text))
+
+
+def rebuild_search_tokens(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    is_postgres = schema_editor.connection.vendor == 'postgresql'
+    posts = Post.objects.only('id', 'title', 'summary', 'body_md', 'search_document')
+    for post in posts.iterator():
+        changes = {'search_tokens': _tokens(post.search_document)}
+        if is_postgres:
+            changes['search_vector'] = (
+                SearchVector(Value(_tokens(post.title), output_field=TextField()), weight='A', config='simple')
+                + SearchVector(Value(_tokens(post.summary), output_field=TextField()), weight='B', config='simple')
+                + SearchVector(Value(_tokens(post.body_md), output_field=TextField()), weight='C', config='simple')
+            )
+        Post.objects.filter(pk=post.pk).update(**changes)
+
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DELETE FROM blog_post_fts')
+        schema_editor.execute(
+            'INSERT INTO blog_post_fts(rowid, search_tokens) '
+            'SELECT id, search_tokens FROM blog_post'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_thumbnailjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_search_tokens, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
+import copy
 import hashlib
 import secrets
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.utils import timezone
 
 
@@ -10,6 +12,12 @@ def generate_api_key():
     return secrets.token_urlsafe(36)
 
 
+# Post 저장 시 파생 필드를 다시 계산할지 판단하는 원본 필드
+SOURCE_FIELDS = ('title', 'summary', 'tags', 'body_md')
+# search_document(검색 텍스트)를 이루는 원본 필드
+SEARCH_SOURCE_FIELDS = {'title', 'summary', 'body_md'}
+
+
 class Post(models.Model):
     title = models.CharField(max_length=300)
     slug = models.SlugField(max_length=300, unique=True, allow_unicode=True)
@@ -17,31 +25,239 @@ class Post(models.Model):
     tags = models.JSONField(default=list, blank=True)
     body_md = models.TextField()
     search_document = models.TextField(blank=True, default='')
+    # 색인용 토큰(한글 bigram + 단어), SQLite FTS5 색인의 원본
+    search_tokens = models.TextField(blank=True, default='', editable=False)
+    # PostgreSQL 전용: 저장 시 제목(A)/요약(B)/본문(C) 가중치로 채우는 tsvector
+    search_vector = SearchVectorField(null=True, editable=False)
     body_html = models.TextField(blank=True, default='')
+    # body_html을 만든 렌더러 버전 (rendering.renderer.version)
+    body_html_version = models.CharField(max_length=32, blank=True, default='', editable=False)
+    # 렌더링 때 함께 만든 파생 정보: 목차(toc), 단어/글자/이미지 수, 읽기 시간(분)
+    doc_meta = models.JSONField(default=dict, blank=True, editable=False)
     thumbnail_url = models.CharField(max_length=500, blank=True, default='')
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # 목록/API 커서 페이지네이션의 (created_at, id) 키셋 정렬용
+            models.Index(fields=['-created_at', '-id'], name='blog_post_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_source_fields()
+        return instance
+
+    def _remember_source_fields(self, update_fields=None):
+        # 지연 로딩(only/defer)으로 읽지 않은 필드와 이번에 저장하지 않은 필드는 기억한 값을 유지
+        loaded = getattr(self, '_loaded_sources', None) if update_fields is not None else None
+        loaded = dict(loaded or {})
+        for name in SOURCE_FIELDS:
+            if name in self.__dict__ and (update_fields is None or name in update_fields):
+                loaded[name] = copy.deepcopy(self.__dict__[name])
+        self._loaded_sources = loaded
+
+    def _stored_source_value(self, name, update_fields):
+        """update_fields에 없어 저장되지 않을 원본 필드는 불러온 값을 씁니다."""
+        loaded = getattr(self, '_loaded_sources', None) or {}
+        if update_fields is not None and name not in update_fields and name in loaded:
+            return loaded[name]
+        return getattr(self, name)
+
+    def get_changed_source_fields(self):
+        """불러온 뒤(또는 마지막 저장 뒤) 값이 바뀐 원본 필드 집합을 반환합니다. 새 글은 전부입니다."""
+        loaded = getattr(self, '_loaded_sources', None)
+        if self._state.adding or loaded is None:
+            return set(SOURCE_FIELDS)
+        changed = set()
+        for name in SOURCE_FIELDS:
+            if name not in self.__dict__:
+                continue
+            if name not in loaded or self.__dict__[name] != loaded[name]:
+                changed.add(name)
+        return changed
+
     def save(self, **kwargs):
-        from .utils import render_markdown, extract_thumbnail_url, generate_thumbnail, normalize_tags
-        self.tags = normalize_tags(self.tags)
-        # 검색 성능을 위해 조회 대상 텍스트를 별도 컬럼으로 유지
-        self.search_document = '\n'.join([
-            self.title or '',
-            self.summary or '',
-            self.body_md or '',
-        ])
-        if self.body_md:
-            self.body_html = render_markdown(self.body_md)
+        """바뀐 원본 필드에 의존하는 파생 필드만 다시 계산해 저장합니다.
+
+        본문이 바뀌면 HTML/메타데이터/썸네일/검색 텍스트를, 제목·요약만 바뀌면 검색
+        텍스트만, 태그가 바뀌면 태그 관계만 갱신합니다. update_fields를 주면 그 안의
+        원본 필드만 보고, 다시 계산한 파생 필드와 updated_at을 update_fields에 더합니다.
+        """
+        from .search_index import build_search_tokens, index_post
+        from .tag_utils import sync_post_tags
+        from .rendering import renderer
+        from .thumbnails import enqueue_thumbnail, initial_thumbnail_url
+        from .utils import extract_thumbnail_url, normalize_tags
+        if 'tags' in self.__dict__:
+            self.tags = normalize_tags(self.tags)
+        changed = self.get_changed_source_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            changed &= update_fields
+
+        derived = set()
+        if changed & SEARCH_SOURCE_FIELDS:
+            # 검색 성능을 위해 조회 대상 텍스트를 별도 컬럼으로 유지
+            # (update_fields로 저장하지 않는 필드는 불러온 값을 써서 저장된 내용만 색인)
+            search_sources = tuple(
+                self._stored_source_value(name, update_fields) or ''
+                for name in ('title', 'summary', 'body_md')
+            )
+            self.search_document = '\n'.join(search_sources)
+            self.search_tokens = build_search_tokens(self.search_document)
+            derived |= {'search_document', 'search_tokens'}
+        if 'body_md' in changed and self.body_md:
+            self.body_html, self.doc_meta = renderer.render_document(self.body_md)
+            self.body_html_version = renderer.version
+            # 썸네일은 작업 큐에서 만들고, 완료 전까지는 원본 이미지 URL을 씀
             original_url = extract_thumbnail_url(self.body_md)
-            self.thumbnail_url = generate_thumbnail(original_url) if original_url else ''
-        super().save(**kwargs)
+            self.thumbnail_url, needs_thumbnail = initial_thumbnail_url(original_url)
+            derived |= {'body_html', 'doc_meta', 'body_html_version', 'thumbnail_url'}
+        if update_fields is not None and changed:
+            kwargs['update_fields'] = update_fields | derived | {'updated_at'}
+
+        with transaction.atomic():
+            super().save(**kwargs)
+            # 태그 관계/통계는 변경분만 반영해 전체 게시글 재집계를 피함
+            if 'tags' in changed:
+                sync_post_tags(self)
+            if 'search_tokens' in derived:
+                index_post(self, search_sources)
+            if 'thumbnail_url' in derived:
+                enqueue_thumbnail(self, original_url if needs_thumbnail else None)
+        self._remember_source_fields(update_fields)
+
+
+class ThumbnailJob(models.Model):
+    """게시글 대표 이미지의 썸네일 생성 작업 큐입니다. thumbnail_worker 명령이 처리합니다."""
+
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='thumbnail_jobs')
+    source_url = models.CharField(max_length=500)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    # 재시도 대기(백오프)가 끝나 다시 가져갈 수 있는 시각
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # 마지막 시도의 처리 시간(ms)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='blog_thumbjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.source_url} ({self.status})'
+
+
+class PostTag(models.Model):
+    """Post.tags를 정규화한 게시글-태그 관계입니다. 태그 필터를 SQL 조인으로 처리합니다."""
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.CharField(max_length=300)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'tag'], name='blog_posttag_post_tag_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'post'], name='blog_posttag_tag_post_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag} on {self.post_id}'
+
+
+class FullTextMatch(models.Lookup):
+    """SQLite FTS5 MATCH 연산자입니다. (`field__match='"검색 색엔"'`)"""
+
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class FullTextDocumentField(models.TextField):
+    """FTS5 가상 테이블의 색인 컬럼입니다. `match` lookup을 지원합니다."""
+
+
+FullTextDocumentField.register_lookup(FullTextMatch)
+
+
+class PostSearchIndex(models.Model):
+    """SQLite FTS5 가상 테이블(blog_post_fts)을 ORM 조인용으로 매핑한 비관리 모델입니다.
+
+    rowid가 Post.id와 같고, rank는 MATCH 질의에서 FTS5가 계산하는 bm25 점수입니다.
+    테이블 생성/동기화는 blog.search_index에서 담당합니다.
+    """
+
+    post = models.OneToOneField(
+        Post, primary_key=True, db_column='rowid',
+        on_delete=models.DO_NOTHING, related_name='search_index',
+    )
+    search_tokens = FullTextDocumentField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_fts'
+
+
+class TagStat(models.Model):
+    """태그별 게시글 수를 미리 집계해 둔 테이블입니다."""
+
+    tag = models.CharField(max_length=300, unique=True)
+    post_count = models.PositiveIntegerField(default=0)
+    last_used = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-post_count', 'tag']
+        indexes = [
+            models.Index(fields=['-post_count', 'tag'], name='blog_tagstat_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag} ({self.post_count})'
+
+
+class TagCooccurrence(models.Model):
+    """두 태그가 같은 게시글에 함께 달린 횟수입니다. 조회 편의를 위해 양방향으로 저장합니다."""
+
+    tag = models.CharField(max_length=300)
+    related_tag = models.CharField(max_length=300)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'related_tag'], name='blog_tagcooc_pair_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-count'], name='blog_tagcooc_tag_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag} + {self.related_tag} ({self.count})'
 
 
 class APIKey(models.Model):
@@ -0,0 +1,172 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import urlencode
+
+from .cache_utils import get_cache_version, get_cache_versions, invalidate_on_commit
+
+# 게시글이 추가/삭제되어 목록 구성이 바뀔 때 무효화되는 서로게이트 키
+PAGE_LIST_SURROGATE = 'page:list'
+# 게시글 내용이 바뀌어 검색 결과가 달라질 수 있을 때 무효화되는 서로게이트 키
+PAGE_SEARCH_SURROGATE = 'page:search'
+
+# 캐시 미스 시 렌더링을 맡은 요청이 잡는 잠금의 유지 시간(초)
+PAGE_RENDER_LOCK_TIMEOUT = 10
+# 다른 요청이 렌더링 중일 때 결과를 기다리는 최대 시간과 확인 간격(초)
+PAGE_RENDER_WAIT = 3
+PAGE_RENDER_POLL_INTERVAL = 0.05
+
+
+def post_surrogate(post_id):
+    """게시글 하나의 내용(제목, 본문, 태그 등)에 의존하는 페이지용 서로게이트 키입니다."""
+    return f'page:post:{post_id}'
+
+
+def comments_surrogate(post_id):
+    """게시글의 댓글 목록에 의존하는 페이지용 서로게이트 키입니다."""
+    return f'page:comments:{post_id}'
+
+
+def tag_surrogate(tag):
+    """태그로 거른 목록 페이지용 서로게이트 키입니다."""
+    return f'page:tag:{hashlib.sha256(tag.encode()).hexdigest()[:16]}'
+
+
+def add_page_surrogates(request, *surrogates):
+    """응답이 의존하는 서로게이트 키를 등록합니다. 등록하지 않은 응답은 캐시하지 않습니다."""
+    if not hasattr(request, 'page_cache_surrogates'):
+        request.page_cache_surrogates = set()
+    request.page_cache_surrogates.update(surrogates)
+
+
+def purge_page_surrogates(*surrogates):
+    """서로게이트 키의 세대를 올려 해당 키가 붙은 캐시 페이지를 모두 무효화합니다."""
+    for surrogate in set(surrogates):
+        invalidate_on_commit(surrogate)
+
+
+def normalized_query_string(request):
+    """쿼리 문자열을 키 순으로 정렬하고 빈 값을 뺀 형태로 만듭니다."""
+    params = []
+    for name, values in sorted(request.GET.lists()):
+        values = [value for value in values if value]
+        if values:
+            params.append((name, values))
+    return urlencode(params, doseq=True)
+
+
+def page_cache_key(request):
+    """경로와 정규화된 쿼리 문자열로 페이지 캐시 키를 만듭니다."""
+    raw = f'{request.scheme}://{request.get_host()}{request.path}?{normalized_query_string(request)}'
+    return f'blog:page:{hashlib.sha256(raw.encode()).hexdigest()[:32]}'
+
+
+def _is_fresh(entry):
+    return get_cache_versions(entry['surrogates']) == entry['surrogates']
+
+
+def _build_response(entry, state):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['X-Page-Cache'] = state
+    return response
+
+
+def _is_cacheable(request, response):
+    # 쿠키를 새로 발급하는 응답(CSRF 토큰 등)은 다른 방문자와 공유할 수 없음
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        and getattr(request, 'page_cache_surrogates', None)
+    )
+
+
+def _store(key, request, response, timeout):
+    surrogates = request.page_cache_surrogates
+    versions = get_cache_versions(surrogates)
+    for surrogate, version in versions.items():
+        if version is None:
+            versions[surrogate] = get_cache_version(surrogate)
+    cache.set(key, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'surrogates': versions,
+    }, timeout)
+
+
+def _wait_for_render(key):
+    deadline = time.monotonic() + PAGE_RENDER_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(PAGE_RENDER_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and _is_fresh(entry):
+            return entry
+    return None
+
+
+def cache_anonymous_page(view_func):
+    """비로그인 GET 응답 전체를 PAGE_CACHE_TIMEOUT 동안 공유 캐시에 보관합니다.
+
+    뷰가 add_page_surrogates()로 등록한 서로게이트 키의 세대를 함께 저장하고, 읽을 때
+    하나라도 바뀌었으면 버립니다. 미스가 나면 잠금을 잡은 요청 하나만 렌더링하고,
+    나머지는 이전 페이지가 있으면 그것을, 없으면 렌더링 결과를 기다렸다가 씁니다.
+    저장은 세션/메시지 미들웨어가 쿠키를 붙인 뒤 PageCacheMiddleware가 합니다.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        if not timeout or request.method != 'GET' or request.user.is_authenticated:
+            return view_func(request, *args, **kwargs)
+
+        key = page_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None and _is_fresh(entry):
+            return _build_response(entry, 'HIT')
+
+        lock_key = f'{key}:lock'
+        if not cache.add(lock_key, 1, PAGE_RENDER_LOCK_TIMEOUT):
+            if entry is not None:
+                return _build_response(entry, 'STALE')
+            entry = _wait_for_render(key)
+            if entry is not None:
+                return _build_response(entry, 'HIT')
+            return view_func(request, *args, **kwargs)
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(lock_key)
+            raise
+        # 저장과 잠금 해제는 미들웨어가 응답을 모두 처리한 뒤에 함
+        request._page_cache_pending = (key, lock_key, timeout)
+        return response
+    return wrapper
+
+
+class PageCacheMiddleware:
+    """cache_anonymous_page가 렌더링한 응답을 다른 미들웨어가 모두 처리한 뒤에 저장합니다.
+
+    뷰 데코레이터 시점에는 세션/메시지 미들웨어가 아직 Set-Cookie를 붙이지 않았으므로,
+    MIDDLEWARE 맨 앞에 두어 최종 응답의 쿠키를 보고 캐시 여부를 정합니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        pending = getattr(request, '_page_cache_pending', None)
+        if pending is not None:
+            key, lock_key, timeout = pending
+            try:
+                if _is_cacheable(request, response):
+                    _store(key, request, response, timeout)
+                    response['X-Page-Cache'] = 'MISS'
+            finally:
+                cache.delete(lock_key)
+        return response
@@ -0,0 +1,121 @@
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from .cache_utils import POST_CACHE_NAMESPACE, versioned_key
+
+COUNT_CACHE_TIMEOUT = 60 * 60
+# 계획기 추정치가 이보다 작으면 정확한 COUNT(*)도 충분히 싸므로 실제로 셈
+ESTIMATE_EXACT_THRESHOLD = 10000
+
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_ESTIMATED = 'estimated'
+COUNT_HAS_NEXT = 'has_next'
+
+
+def get_count_strategy(view_name):
+    """PAGINATION_COUNT_STRATEGIES 설정에서 뷰별 개수 전략을 읽습니다. 없으면 exact입니다."""
+    return getattr(settings, 'PAGINATION_COUNT_STRATEGIES', {}).get(view_name, COUNT_EXACT)
+
+
+def cached_count(queryset, *key_parts):
+    """정확한 개수를 posts 캐시 세대 동안 공유 캐시에 보관합니다. (게시글 쓰기 시 무효화)"""
+    key = versioned_key(POST_CACHE_NAMESPACE, 'count', *key_parts)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def estimated_count(queryset, exact_below=ESTIMATE_EXACT_THRESHOLD):
+    """PostgreSQL 계획기 통계(EXPLAIN의 Plan Rows)로 개수를 추정합니다.
+
+    추정치가 exact_below보다 작거나 PostgreSQL이 아니면 정확히 셉니다.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    rows = int(plan[0]['Plan']['Plan Rows'])
+    return rows if rows >= exact_below else queryset.count()
+
+
+class CountedPaginator(Paginator):
+    """전체 개수를 count_func로 구하는 Paginator입니다. (캐시/추정 개수용)"""
+
+    def __init__(self, object_list, per_page, count_func=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count_func = count_func
+
+    @cached_property
+    def count(self):
+        if self._count_func is None:
+            return super().count
+        return self._count_func()
+
+
+class HasNextPaginator(Paginator):
+    """COUNT 없이 per_page + 1행을 읽어 다음 페이지가 있는지만 판단하는 Paginator입니다.
+
+    count와 num_pages는 현재 페이지까지 확인된 범위(다음 페이지가 있으면 +1)만 반영합니다.
+    """
+
+    def validate_number(self, number):
+        # 전체 페이지 수를 모르므로 상한 검사는 page()에서 빈 결과로 판단
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        self.count = bottom + len(rows)
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(rows[:self.per_page], number, self)
+
+    def get_page(self, number):
+        try:
+            return self.page(number)
+        except (EmptyPage, PageNotAnInteger):
+            return self.page(1)
+
+    @cached_property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+
+def make_paginator(queryset, per_page, strategy, count_key=()):
+    """개수 전략에 맞는 Paginator를 만듭니다.
+
+    exact는 매번 COUNT(*), cached는 count_key별 캐시된 정확한 개수, estimated는 계획기
+    추정치, has_next는 COUNT 없이 다음 페이지 존재 여부만 확인합니다.
+    """
+    if strategy == COUNT_CACHED:
+        return CountedPaginator(queryset, per_page, lambda: cached_count(queryset, *count_key))
+    if strategy == COUNT_ESTIMATED:
+        return CountedPaginator(queryset, per_page, lambda: estimated_count(queryset))
+    if strategy == COUNT_HAS_NEXT:
+        return HasNextPaginator(queryset, per_page)
+    return Paginator(queryset, per_page)
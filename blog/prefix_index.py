@@ -0,0 +1,55 @@
+import bisect
+import heapq
+
+# 접두어 범위의 상한을 만들 때 쓰는, 어떤 문자보다도 뒤에 정렬되는 코드포인트
+_PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+class PrefixIndex:
+    """정렬된 (key, rank, value) 목록에서 접두어 검색을 수행합니다.
+
+    rank가 작을수록 상위 결과입니다. 범위 탐색은 bisect로 O(log n)이고,
+    범위 안에서 상위 limit개만 heap으로 고릅니다.
+    """
+
+    def __init__(self, entries=()):
+        self._entries = sorted(entries)
+        self._keys = [entry[0] for entry in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        """(key, rank, value) 항목을 정렬 순서를 유지하며 추가합니다."""
+        idx = bisect.bisect_left(self._entries, entry)
+        self._entries.insert(idx, entry)
+        self._keys.insert(idx, entry[0])
+
+    def remove(self, entry):
+        """항목이 있으면 제거합니다."""
+        idx = bisect.bisect_left(self._entries, entry)
+        if idx < len(self._entries) and self._entries[idx] == entry:
+            del self._entries[idx]
+            del self._keys[idx]
+
+    def _candidates(self, prefix):
+        if not prefix:
+            return self._entries
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + _PREFIX_UPPER_BOUND, lo)
+        return self._entries[lo:hi]
+
+    def search(self, prefix, limit):
+        """prefix로 시작하는 key 중 rank 상위 limit개의 value를 반환합니다."""
+        if limit <= 0:
+            return []
+        candidates = self._candidates(prefix)
+        return [entry[2] for entry in heapq.nsmallest(limit, candidates, key=lambda e: (e[1], e[0]))]
+
+    def iter_search(self, prefix):
+        """prefix로 시작하는 key의 value를 rank 순으로 필요한 만큼만 꺼내는 이터레이터를 반환합니다."""
+        candidates = self._candidates(prefix)
+        heap = [(entry[1], entry[0], idx) for idx, entry in enumerate(candidates)]
+        heapq.heapify(heap)
+        while heap:
+            yield candidates[heapq.heappop(heap)[2]][2]
@@ -0,0 +1,92 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# SQLite 진행 핸들러를 호출할 VM 명령 간격
+_SQLITE_PROGRESS_STEPS = 1000
+# PostgreSQL query_canceled (statement_timeout 초과)
+_PG_QUERY_CANCELED = '57014'
+
+DEGRADATION_KINDS = ('search', 'search_fallback')
+
+
+class QueryDeadlineExceeded(Exception):
+    """query_deadline() 안의 질의가 시간 예산을 넘겨 중단되었습니다."""
+
+
+@contextmanager
+def query_deadline(budget_ms):
+    """블록 안의 DB 질의에 시간 예산(ms)을 적용합니다.
+
+    PostgreSQL은 트랜잭션 범위의 statement_timeout으로, SQLite는 진행 핸들러로 질의를
+    중단하며, 예산 초과로 중단되면 QueryDeadlineExceeded를 발생시킵니다.
+    """
+    if not budget_ms:
+        yield
+        return
+
+    started = time.monotonic()
+    deadline = started + budget_ms / 1000
+
+    def exceeded(exc):
+        cause = getattr(exc, '__cause__', None)
+        return getattr(cause, 'pgcode', None) == _PG_QUERY_CANCELED or time.monotonic() >= deadline
+
+    if connection.vendor == 'postgresql':
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL statement_timeout = %s', [int(budget_ms)])
+                yield
+        except OperationalError as exc:
+            if exceeded(exc):
+                raise QueryDeadlineExceeded(f'{budget_ms}ms') from exc
+            raise
+        return
+
+    if connection.vendor == 'sqlite':
+        connection.ensure_connection()
+        raw_connection = connection.connection
+        raw_connection.set_progress_handler(
+            lambda: 1 if time.monotonic() >= deadline else 0,
+            _SQLITE_PROGRESS_STEPS,
+        )
+        try:
+            yield
+        except OperationalError as exc:
+            if exceeded(exc):
+                raise QueryDeadlineExceeded(f'{budget_ms}ms') from exc
+            raise
+        finally:
+            raw_connection.set_progress_handler(None, 0)
+        return
+
+    yield
+
+
+def _degradation_key(kind):
+    return f'blog:stats:degraded:{kind}'
+
+
+def record_degradation(kind):
+    """시간 예산 초과로 축소 경로를 쓴 횟수를 공유 캐시 카운터에 더합니다."""
+    key = _degradation_key(kind)
+    cache.add(key, 0, timeout=None)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+        count = 1
+    logger.warning('Query budget exceeded (%s), degraded response #%d', kind, count)
+    return count
+
+
+def get_degradation_counts():
+    """종류별 축소 응답 횟수를 반환합니다."""
+    counts = cache.get_many([_degradation_key(kind) for kind in DEGRADATION_KINDS])
+    return {kind: counts.get(_degradation_key(kind), 0) for kind in DEGRADATION_KINDS}
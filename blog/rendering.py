@@ -0,0 +1,186 @@
+import hashlib
+import html as html_lib
+import math
+import re
+import threading
+
+import bleach
+import markdown
+import pygments
+from bleach.sanitizer import Cleaner
+from markdown.extensions.toc import slugify_unicode
+
+ALLOWED_TAGS = [
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'a', 'img', 'ul', 'ol', 'li',
+    'code', 'pre', 'blockquote',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td',
+    'em', 'strong', 'br', 'hr', 'div', 'span',
+]
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'img': ['src', 'alt', 'title'],
+    'code': ['class'],
+    # 목차 앵커(toc 확장이 붙이는 제목 id)
+    **{f'h{level}': ['id'] for level in range(1, 7)},
+    # codehilite 래퍼(div.codehilite)와 Pygments 토큰(span.k, span.nf 등) 클래스
+    'div': ['class'],
+    'span': ['class'],
+}
+ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
+# 코드 블록은 저장 시 Pygments로 하이라이팅 (색상은 static/css/pygments.css)
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'codehilite', 'toc']
+
+
+def heading_anchor(value, separator):
+    """제목 텍스트로 앵커 id를 만듭니다. 한글을 유지하고, 페이지의 다른 id와 겹치지 않도록 접두어를 붙입니다."""
+    return 'h-' + slugify_unicode(value, separator)
+
+
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {'css_class': 'codehilite', 'guess_lang': False},
+    'toc': {'slugify': heading_anchor},
+}
+
+# parse/measure 단계 코드를 바꿔 출력(body_html, doc_meta)이 달라지면 올림
+RENDERER_REVISION = 1
+
+# 분당 읽는 양 — 한글은 글자 수, 그 밖의 언어는 단어 수 기준
+HANGUL_CHARS_PER_MINUTE = 500
+WORDS_PER_MINUTE = 200
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_IMG_RE = re.compile(r'<img\b', re.IGNORECASE)
+_WORD_RE = re.compile(r'\w+')
+_HANGUL_RE = re.compile(r'[\uac00-\ud7a3]')
+
+
+def _describe(value):
+    # 함수 설정값은 주소가 아닌 이름으로 버전에 반영 (프로세스마다 같은 버전이 나오도록)
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    return value
+
+
+def _toc_tree(tokens):
+    return [
+        {
+            'level': token['level'],
+            'id': token['id'],
+            'title': html_lib.unescape(token['name']),
+            'children': _toc_tree(token['children']),
+        }
+        for token in tokens
+    ]
+
+
+class MarkdownRenderer:
+    """마크다운 → sanitized HTML 변환 엔진입니다.
+
+    parse → sanitize → postprocess → measure 단계를 순서대로 거치며, 각 단계는 HTML과
+    문서 메타데이터(dict)를 받아 HTML을 돌려줍니다. 목차와 분량 같은 메타데이터는 같은
+    렌더링에서 함께 만들어 Post.doc_meta에 저장합니다. 마크다운 파서와 bleach Cleaner는
+    스레드 안전하지 않으므로 스레드마다 한 번 만들어 재사용하고, 파서는 문서마다
+    reset()합니다. version은 출력에 영향을 주는 설정으로 만든 문자열로 body_html과 함께
+    저장해 다시 렌더링할 글을 찾는 데 씁니다.
+    """
+
+    stages = ('parse', 'sanitize', 'postprocess', 'measure')
+
+    def __init__(self, extensions=MARKDOWN_EXTENSIONS, extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+                 tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, protocols=ALLOWED_PROTOCOLS,
+                 postprocessors=()):
+        self.extensions = list(extensions)
+        self.extension_configs = {name: dict(config) for name, config in (extension_configs or {}).items()}
+        self.tags = list(tags)
+        self.attributes = {tag: list(names) for tag, names in attributes.items()}
+        self.protocols = list(protocols)
+        self.postprocessors = list(postprocessors)
+        self.version = self._build_version()
+        self._local = threading.local()
+
+    def _build_version(self):
+        config = repr((
+            RENDERER_REVISION, self.stages, self.extensions,
+            sorted(
+                (name, sorted((key, _describe(value)) for key, value in config.items()))
+                for name, config in self.extension_configs.items()
+            ),
+            self.tags, sorted(self.attributes.items()), self.protocols,
+            [_describe(func) for func in self.postprocessors],
+            markdown.__version__, bleach.__version__, pygments.__version__,
+        ))
+        return hashlib.sha256(config.encode()).hexdigest()[:12]
+
+    def _parser(self):
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = markdown.Markdown(
+                extensions=self.extensions, extension_configs=self.extension_configs,
+            )
+        return parser
+
+    def _cleaner(self):
+        cleaner = getattr(self._local, 'cleaner', None)
+        if cleaner is None:
+            cleaner = self._local.cleaner = Cleaner(
+                tags=self.tags, attributes=self.attributes, protocols=self.protocols,
+            )
+        return cleaner
+
+    def parse(self, body_md, meta):
+        parser = self._parser()
+        try:
+            html = parser.convert(body_md)
+            meta['toc'] = _toc_tree(getattr(parser, 'toc_tokens', []))
+            return html
+        finally:
+            parser.reset()
+
+    def sanitize(self, html, meta):
+        return self._cleaner().clean(html)
+
+    def postprocess(self, html, meta):
+        for postprocessor in self.postprocessors:
+            html = postprocessor(html)
+        return html
+
+    def measure(self, html, meta):
+        """본문 텍스트의 단어/글자 수, 이미지 수, 예상 읽기 시간(분)을 기록합니다."""
+        text = html_lib.unescape(_TAG_RE.sub(' ', html))
+        words = _WORD_RE.findall(text)
+        hangul_chars = len(_HANGUL_RE.findall(text))
+        other_words = sum(1 for word in words if not _HANGUL_RE.search(word))
+        minutes = hangul_chars / HANGUL_CHARS_PER_MINUTE + other_words / WORDS_PER_MINUTE
+        meta.update({
+            'word_count': len(words),
+            'char_count': sum(1 for char in text if not char.isspace()),
+            'image_count': len(_IMG_RE.findall(html)),
+            'reading_minutes': max(1, math.ceil(minutes)) if words else 0,
+        })
+        return html
+
+    def render_document(self, body_md):
+        """모든 단계를 순서대로 적용한 (HTML, 문서 메타데이터)를 반환합니다."""
+        meta = {}
+        result = body_md
+        for stage in self.stages:
+            result = getattr(self, stage)(result, meta)
+        return result, meta
+
+    def render(self, body_md):
+        """모든 단계를 순서대로 적용한 HTML을 반환합니다."""
+        return self.render_document(body_md)[0]
+
+
+renderer = MarkdownRenderer()
+
+
+def render_markdown(body_md):
+    """기본 렌더러로 마크다운 텍스트를 sanitized HTML로 변환합니다."""
+    return renderer.render(body_md)
+
+
+def render_markdown_document(body_md):
+    """기본 렌더러로 (sanitized HTML, 문서 메타데이터)를 만듭니다. (프로세스 풀에서 호출 가능)"""
+    return renderer.render_document(body_md)
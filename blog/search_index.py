@@ -0,0 +1,310 @@
+import hashlib
+import re
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector, TrigramWordSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import TextField, Value
+
+from .cache_utils import POST_CACHE_NAMESPACE, get_cache_version, invalidate_on_commit, versioned_key
+from .models import Post
+from .prefix_index import PrefixIndex
+from .query_budget import QueryDeadlineExceeded, query_deadline, record_degradation
+from .utils import is_hangul_bigram, tokenize_search_text
+
+FTS_TABLE = 'blog_post_fts'
+SEARCH_CONFIG = 'simple'
+SEARCH_CACHE_TIMEOUT = 10 * 60
+# 시간 예산 초과 시 대신 쓸 직전 결과 보관 기간
+SEARCH_STALE_TIMEOUT = 24 * 60 * 60
+
+# 제목 안에서 접두어 검색을 시작할 수 있는 위치(단어 시작)
+_TITLE_WORD_RE = re.compile(r'\w+')
+# 늦게 커밋된 저장을 놓치지 않도록 마지막 동기화 시각보다 조금 앞부터 다시 읽음
+_TITLE_SYNC_OVERLAP = timedelta(minutes=5)
+
+
+def uses_sqlite_fts():
+    """현재 DB가 SQLite FTS5 색인을 사용하는지 여부를 반환합니다."""
+    return connection.vendor == 'sqlite'
+
+
+def uses_postgres_search():
+    """현재 DB가 PostgreSQL 전문 검색(search_vector 컬럼)을 사용하는지 여부를 반환합니다."""
+    return connection.vendor == 'postgresql'
+
+
+def build_search_tokens(text):
+    """색인용 토큰 문자열(공백 구분)을 만듭니다."""
+    return ' '.join(tokenize_search_text(text))
+
+
+def weighted_search_vector(title, summary, body_md):
+    """제목(A) > 요약(B) > 본문(C) 가중치를 준 tsvector 식을 토큰화한 텍스트로 만듭니다."""
+    vector = None
+    for text, weight in ((title, 'A'), (summary, 'B'), (body_md, 'C')):
+        part = SearchVector(
+            Value(build_search_tokens(text), output_field=TextField()),
+            weight=weight, config=SEARCH_CONFIG,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def index_post(post, sources=None):
+    """게시글을 검색 색인에 반영합니다.
+
+    PostgreSQL은 저장된 search_vector 컬럼을, SQLite는 FTS5 가상 테이블을 갱신합니다.
+    sources는 실제로 저장한 (제목, 요약, 본문)이며, 없으면 인스턴스 값을 씁니다.
+    """
+    if uses_postgres_search():
+        if sources is None:
+            sources = (post.title, post.summary, post.body_md)
+        Post.objects.filter(pk=post.pk).update(search_vector=weighted_search_vector(*sources))
+        return
+    if not uses_sqlite_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, search_tokens) VALUES (%s, %s)',
+            [post.pk, post.search_tokens],
+        )
+
+
+def unindex_post(post_id):
+    """삭제된 게시글을 FTS5 색인에서 제거합니다. (SQLite 전용)"""
+    if not uses_sqlite_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_search_index():
+    """검색 토큰과 색인을 blog_post 기준으로 다시 만들고 처리한 게시글 수를 반환합니다."""
+    total = 0
+    posts = Post.objects.only('id', 'title', 'summary', 'body_md', 'search_document')
+    for post in posts.iterator():
+        changes = {'search_tokens': build_search_tokens(post.search_document)}
+        if uses_postgres_search():
+            changes['search_vector'] = weighted_search_vector(post.title, post.summary, post.body_md)
+        Post.objects.filter(pk=post.pk).update(**changes)
+        total += 1
+
+    if uses_sqlite_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE}(rowid, search_tokens) '
+                'SELECT id, search_tokens FROM blog_post'
+            )
+    invalidate_on_commit(POST_CACHE_NAMESPACE)
+    return total
+
+
+def get_cached_search_result(expression, ordering, compute, fallback):
+    """검색식+정렬 기준별로 compute() 결과(정렬된 게시글 id 목록 등)를 캐시합니다.
+
+    키는 build_search_expression()의 정규화된 출력이라 같은 검색을 다르게 입력해도
+    같은 항목을 쓰며, 게시글이 저장/삭제되면 posts 세대가 바뀌어 함께 무효화됩니다.
+    compute()가 SEARCH_QUERY_TIMEOUT_MS를 넘기면 세대와 무관하게 보관한 직전 결과를,
+    없으면 fallback() 결과를 씁니다. (결과, 축소 응답 여부)를 반환합니다.
+    """
+    digest = hashlib.sha256(f'{ordering}|{expression}'.encode()).hexdigest()[:16]
+    key = versioned_key(POST_CACHE_NAMESPACE, 'search', digest)
+    stale_key = f'blog:{POST_CACHE_NAMESPACE}:stale:search:{digest}'
+    result = cache.get(key)
+    if result is not None:
+        return result, False
+
+    try:
+        with query_deadline(settings.SEARCH_QUERY_TIMEOUT_MS):
+            result = compute()
+    except QueryDeadlineExceeded:
+        record_degradation('search')
+        stale = cache.get(stale_key)
+        if stale is not None:
+            return stale, True
+        try:
+            with query_deadline(settings.SEARCH_QUERY_TIMEOUT_MS):
+                return fallback(), True
+        except QueryDeadlineExceeded:
+            record_degradation('search_fallback')
+            return None, True
+
+    cache.set(key, result, SEARCH_CACHE_TIMEOUT)
+    cache.set(stale_key, result, SEARCH_STALE_TIMEOUT)
+    return result, False
+
+
+def apply_fuzzy_search(posts_qs, search_terms):
+    """pg_trgm 단어 유사도로 오타가 섞인 검색어에 가까운 게시글을 찾습니다. (PostgreSQL 전용)
+
+    `%>` 연산자는 search_document의 trigram GIN 색인을 타며, 임계값은
+    SEARCH_FUZZY_THRESHOLD 설정으로 pg_trgm.word_similarity_threshold에 지정합니다.
+    """
+    if not search_terms:
+        return posts_qs
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+            [str(settings.SEARCH_FUZZY_THRESHOLD)],
+        )
+
+    rank = None
+    for term in search_terms:
+        posts_qs = posts_qs.filter(search_document__trigram_word_similar=term)
+        similarity = TrigramWordSimilarity(term, 'search_document')
+        rank = similarity if rank is None else rank + similarity
+    return posts_qs.annotate(search_rank=rank).order_by('-search_rank', '-created_at')
+
+
+def _tokenize_terms(search_terms):
+    """검색어별 토큰 목록과 토큰이 없는 검색어 목록을 반환합니다."""
+    tokenized = []
+    leftover_terms = []
+    for term in search_terms:
+        tokens = tokenize_search_text(term)
+        if tokens:
+            tokenized.append(tokens)
+        else:
+            leftover_terms.append(term)
+    return tokenized, leftover_terms
+
+
+def build_fts_query(search_terms):
+    """검색어 목록을 FTS5 MATCH 식으로 변환합니다.
+
+    색인과 같은 규칙으로 토큰화한 뒤 검색어마다 연속된 토큰 구문(phrase)으로 찾으므로
+    한글은 부분 문자열(`검색` → `검색을`)도 색인으로 매칭됩니다. 마지막 토큰이 한글
+    bigram이 아니면 접두어로 검색합니다. 토큰이 없는 검색어는 FTS로 처리할 수 없으므로
+    (match 식, 남은 검색어) 형태로 따로 돌려줍니다.
+    """
+    tokenized, leftover_terms = _tokenize_terms(search_terms)
+    phrases = []
+    for tokens in tokenized:
+        phrase = '"' + ' '.join(tokens) + '"'
+        if not is_hangul_bigram(tokens[-1]):
+            phrase += '*'
+        phrases.append(phrase)
+    return ' AND '.join(phrases), leftover_terms
+
+
+def build_tsquery(search_terms):
+    """검색어 목록을 search_vector용 SearchQuery로 변환합니다. (PostgreSQL 전용)
+
+    build_fts_query와 같은 토큰/접두어 규칙을 `<->` 인접 연산자로 표현하며,
+    (SearchQuery 또는 None, 남은 검색어)를 반환합니다.
+    """
+    tokenized, leftover_terms = _tokenize_terms(search_terms)
+    query = None
+    for tokens in tokenized:
+        raw = ' <-> '.join(f"'{token}'" for token in tokens)
+        if not is_hangul_bigram(tokens[-1]):
+            raw += ':*'
+        term_query = SearchQuery(raw, config=SEARCH_CONFIG, search_type='raw')
+        query = term_query if query is None else query & term_query
+    return query, leftover_terms
+
+
+class TitleSuggestIndex:
+    """게시글 제목의 단어 시작 위치마다 접두어 검색이 되도록 만든 프로세스 내 인덱스입니다.
+
+    posts 캐시 세대가 바뀌면 마지막 동기화 이후 저장된 글만 다시 읽어 반영하고,
+    게시글 수가 맞지 않을 때만 id 목록으로 삭제된 글을 찾아 제거합니다.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.synced_at = None
+        self._index = PrefixIndex()
+        self._entries_by_post = {}
+
+    def __len__(self):
+        return len(self._entries_by_post)
+
+    def search(self, prefix, limit):
+        """prefix로 시작하는 단어가 제목에 있는 글을 최신순으로 (id, 제목, slug) 목록으로 반환합니다."""
+        results = []
+        seen = set()
+        if limit <= 0:
+            return results
+        # 한 제목이 여러 위치에서 맞을 수 있으므로 서로 다른 글이 limit개 모일 때까지 읽음
+        for value in self._index.iter_search(prefix):
+            if value[0] in seen:
+                continue
+            seen.add(value[0])
+            results.append(value)
+            if len(results) == limit:
+                break
+        return results
+
+    def sync(self, version):
+        rows = Post.objects.order_by().values_list('id', 'title', 'slug', 'created_at', 'updated_at')
+        if self.synced_at is None:
+            self._build(rows.iterator())
+        else:
+            rows = rows.filter(updated_at__gte=self.synced_at - _TITLE_SYNC_OVERLAP)
+            for row in rows.iterator():
+                self._put(*row)
+
+        if len(self._entries_by_post) != Post.objects.count():
+            live_ids = set(Post.objects.values_list('id', flat=True))
+            for post_id in set(self._entries_by_post) - live_ids:
+                self._discard(post_id)
+        self.version = version
+
+    def _build(self, rows):
+        """첫 동기화: 항목을 모두 모은 뒤 한 번에 정렬해 인덱스를 만듭니다. (add를 반복하면 O(n²))"""
+        self._entries_by_post = {}
+        for post_id, title, slug, created_at, updated_at in rows:
+            self._entries_by_post[post_id] = self._entries(post_id, title, slug, created_at)
+            self._touch(updated_at)
+        self._index = PrefixIndex(
+            entry for entries in self._entries_by_post.values() for entry in entries
+        )
+
+    def _put(self, post_id, title, slug, created_at, updated_at):
+        self._discard(post_id)
+        entries = self._entries(post_id, title, slug, created_at)
+        for entry in entries:
+            self._index.add(entry)
+        self._entries_by_post[post_id] = entries
+        self._touch(updated_at)
+
+    def _entries(self, post_id, title, slug, created_at):
+        normalized = (title or '').strip().lower()
+        value = (post_id, title, slug)
+        rank = -created_at.timestamp()
+        keys = {normalized[match.start():] for match in _TITLE_WORD_RE.finditer(normalized)}
+        keys.add(normalized)
+        return [(key, rank, value) for key in sorted(keys)]
+
+    def _touch(self, updated_at):
+        if self.synced_at is None or updated_at > self.synced_at:
+            self.synced_at = updated_at
+
+    def _discard(self, post_id):
+        for entry in self._entries_by_post.pop(post_id, ()):
+            self._index.remove(entry)
+
+
+_title_suggest_index = TitleSuggestIndex()
+_title_suggest_index_lock = threading.Lock()
+
+
+def suggest_titles(prefix, limit=8):
+    """제목 단어가 prefix로 시작하는 게시글을 최신순으로 (id, 제목, slug) 목록으로 반환합니다."""
+    prefix = str(prefix or '').strip().lower()
+    if not prefix:
+        return []
+
+    version = get_cache_version(POST_CACHE_NAMESPACE)
+    with _title_suggest_index_lock:
+        if _title_suggest_index.version != version:
+            _title_suggest_index.sync(version)
+        return _title_suggest_index.search(prefix, limit)
@@ -1,8 +1,16 @@
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from allauth.socialaccount.signals import pre_social_login
 
+from .cache_utils import POST_CACHE_NAMESPACE, invalidate_on_commit
+from .models import Comment, Post, PostTag
+from .page_cache import (
+    PAGE_LIST_SURROGATE, PAGE_SEARCH_SURROGATE, comments_surrogate, post_surrogate,
+    purge_page_surrogates, tag_surrogate,
+)
+
 
 @receiver(pre_social_login)
 def grant_staff_to_owner(sender, request, sociallogin, **kwargs):
@@ -22,3 +30,38 @@ def grant_staff_to_owner(sender, request, sociallogin, **kwargs):
         user.is_superuser = True
         if user.pk:
             user.save(update_fields=['is_staff', 'is_superuser'])
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_post(sender, instance, **kwargs):
+    """단건/일괄 삭제 모두 게시글마다 호출되어 태그 통계와 검색 색인을 정리합니다."""
+    from .search_index import unindex_post
+    from .tag_utils import release_post_tags
+    release_post_tags(instance)
+    unindex_post(instance.pk)
+    invalidate_on_commit(POST_CACHE_NAMESPACE)
+    purge_page_surrogates(
+        post_surrogate(instance.pk), PAGE_LIST_SURROGATE, PAGE_SEARCH_SURROGATE,
+        *(tag_surrogate(tag) for tag in instance.tags),
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, created, **kwargs):
+    """게시글이 저장되면 검색 결과 등 게시글 파생 캐시와 이 글이 보이는 캐시 페이지를 무효화합니다."""
+    invalidate_on_commit(POST_CACHE_NAMESPACE)
+    tags = set(instance.tags)
+    surrogates = [post_surrogate(instance.pk), PAGE_SEARCH_SURROGATE]
+    if created:
+        surrogates.append(PAGE_LIST_SURROGATE)
+    else:
+        # post_save는 Post.save()의 sync_post_tags() 전에 호출되므로 PostTag에는 이전 태그가 남아 있음
+        tags.update(PostTag.objects.filter(post=instance).values_list('tag', flat=True))
+    purge_page_surrogates(*surrogates, *(tag_surrogate(tag) for tag in tags))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """댓글이 추가/삭제되면 해당 글 상세의 캐시 페이지만 무효화합니다."""
+    purge_page_surrogates(comments_surrogate(instance.post_id))
@@ -1,18 +1,237 @@
-from .models import Post
-from .utils import normalize_tag
+import hashlib
+import threading
+from collections import Counter, defaultdict
+from itertools import permutations
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from .cache_utils import get_cache_version, invalidate_on_commit, versioned_key
+from .models import Post, PostTag, TagCooccurrence, TagStat
+from .prefix_index import PrefixIndex
+from .utils import normalize_tag, normalize_tags
+
+TAG_CACHE_NAMESPACE = 'tags'
+TAG_CACHE_TIMEOUT = 60 * 60
+TAG_FACET_LIMIT = 20
+
+# 프로세스별 태그 접두어 인덱스: (태그 캐시 세대, PrefixIndex)
+_tag_prefix_index = (None, PrefixIndex())
+_tag_prefix_index_lock = threading.Lock()
 
 
 def get_sorted_tag_counts():
     """전체 게시글의 태그를 빈도 내림차순으로 반환합니다."""
-    tag_count = {}
-    for post in Post.objects.only('tags'):
-        if not isinstance(post.tags, list):
-            continue
-        seen_in_post = set()
-        for raw_tag in post.tags:
-            tag = normalize_tag(raw_tag)
-            if not tag or tag in seen_in_post:
-                continue
-            seen_in_post.add(tag)
-            tag_count[tag] = tag_count.get(tag, 0) + 1
-    return sorted(tag_count.items(), key=lambda x: x[1], reverse=True)
+    return list(
+        TagStat.objects
+        .filter(post_count__gt=0)
+        .order_by('-post_count', 'tag')
+        .values_list('tag', 'post_count')
+    )
+
+
+def get_cached_tag_counts():
+    """get_sorted_tag_counts() 결과를 워커 간 공유 캐시를 거쳐 반환합니다."""
+    key = versioned_key(TAG_CACHE_NAMESPACE, 'sorted_counts')
+    tag_items = cache.get(key)
+    if tag_items is None:
+        tag_items = get_sorted_tag_counts()
+        cache.set(key, tag_items, TAG_CACHE_TIMEOUT)
+    return tag_items
+
+
+def get_tag_prefix_index():
+    """태그 캐시 세대가 바뀐 경우에만 프로세스 내 접두어 인덱스를 다시 만듭니다."""
+    global _tag_prefix_index
+    version = get_cache_version(TAG_CACHE_NAMESPACE)
+    built_version, index = _tag_prefix_index
+    if built_version == version:
+        return index
+
+    with _tag_prefix_index_lock:
+        built_version, index = _tag_prefix_index
+        if built_version != version:
+            index = PrefixIndex(
+                (tag, -count, (tag, count))
+                for tag, count in get_cached_tag_counts()
+            )
+            _tag_prefix_index = (version, index)
+    return index
+
+
+def suggest_tags(prefix, limit=10):
+    """normalize_tag 규칙으로 정규화한 접두어에 맞는 태그를 빈도순으로 반환합니다."""
+    prefix = str(prefix or '').strip()
+    normalized = normalize_tag(prefix) if prefix else ''
+    if prefix and not normalized:
+        return []
+    return get_tag_prefix_index().search(normalized, limit)
+
+
+def get_related_tags(tags, limit=8):
+    """선택한 태그들과 함께 자주 쓰인 태그를 (태그, 동시 출현 수) 목록으로 반환합니다.
+
+    게시글을 훑지 않고 TagCooccurrence의 (tag, -count) 인덱스만 조회하며,
+    결과는 태그 캐시 세대 동안 공유 캐시에 보관합니다.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return []
+
+    tags_digest = hashlib.sha256(','.join(tags).encode()).hexdigest()[:16]
+    key = versioned_key(TAG_CACHE_NAMESPACE, 'related', tags_digest, limit)
+    related = cache.get(key)
+    if related is None:
+        related = list(
+            TagCooccurrence.objects
+            .filter(tag__in=tags, count__gt=0)
+            .exclude(related_tag__in=tags)
+            .values('related_tag')
+            .annotate(total=Sum('count'))
+            .order_by('-total', 'related_tag')
+            .values_list('related_tag', 'total')[:limit]
+        )
+        cache.set(key, related, TAG_CACHE_TIMEOUT)
+    return related
+
+
+def filter_posts_by_tags(posts_qs, tags):
+    """지정한 태그 중 하나라도 가진 게시글로 좁힙니다. (PostTag 서브쿼리, 지연 평가 유지)"""
+    if not tags:
+        return posts_qs
+    tagged_post_ids = PostTag.objects.filter(tag__in=list(tags)).values('post_id')
+    return posts_qs.filter(pk__in=tagged_post_ids)
+
+
+def filter_posts_by_all_tags(posts_qs, tags):
+    """지정한 태그를 모두 가진 게시글로 좁힙니다. (태그마다 PostTag 서브쿼리, 지연 평가 유지)"""
+    for tag in tags:
+        posts_qs = posts_qs.filter(pk__in=PostTag.objects.filter(tag=tag).values('post_id'))
+    return posts_qs
+
+
+def get_tag_facets(posts_qs, limit=TAG_FACET_LIMIT):
+    """posts_qs에 속한 게시글의 태그별 개수를 (태그, 게시글 수) 목록으로 반환합니다.
+
+    태그마다 따로 세지 않고 PostTag를 한 번의 GROUP BY 집계로 묶어 셉니다.
+    """
+    return list(
+        PostTag.objects
+        .filter(post_id__in=posts_qs.values('pk'))
+        .values('tag')
+        .annotate(post_count=Count('post_id'))
+        .order_by('-post_count', 'tag')
+        .values_list('tag', 'post_count')[:limit]
+    )
+
+
+def sync_post_tags(post):
+    """저장된 게시글의 Post.tags 변경분을 PostTag 관계와 TagStat 집계에 반영합니다."""
+    old_tags = set(PostTag.objects.filter(post=post).values_list('tag', flat=True))
+    new_tags = set(post.tags)
+    removed = old_tags - new_tags
+    added = new_tags - old_tags
+    if removed:
+        PostTag.objects.filter(post=post, tag__in=list(removed)).delete()
+    if added:
+        PostTag.objects.bulk_create([PostTag(post=post, tag=tag) for tag in sorted(added)])
+    apply_cooccurrence_delta(
+        removed=set(permutations(old_tags, 2)) - set(permutations(new_tags, 2)),
+        added=set(permutations(new_tags, 2)) - set(permutations(old_tags, 2)),
+    )
+    apply_tag_delta(removed=removed, added=added)
+
+
+def release_post_tags(post):
+    """삭제된 게시글의 태그를 TagStat/TagCooccurrence 집계에서 차감합니다."""
+    tags = set(normalize_tags(post.tags))
+    apply_cooccurrence_delta(removed=set(permutations(tags, 2)))
+    apply_tag_delta(removed=tags)
+
+
+def apply_cooccurrence_delta(removed=(), added=()):
+    """(tag, related_tag) 방향쌍의 동시 출현 수 변경분을 태그별 묶음 쿼리로 반영합니다."""
+    removed_by_tag = defaultdict(set)
+    for tag, related_tag in removed:
+        removed_by_tag[tag].add(related_tag)
+    for tag, related_tags in removed_by_tag.items():
+        TagCooccurrence.objects.filter(
+            tag=tag, related_tag__in=list(related_tags), count__gt=0,
+        ).update(count=F('count') - 1)
+
+    added_by_tag = defaultdict(set)
+    for tag, related_tag in added:
+        added_by_tag[tag].add(related_tag)
+    for tag, related_tags in added_by_tag.items():
+        pairs = TagCooccurrence.objects.filter(tag=tag, related_tag__in=list(related_tags))
+        existing = set(pairs.values_list('related_tag', flat=True))
+        if existing:
+            pairs.filter(related_tag__in=list(existing)).update(count=F('count') + 1)
+        TagCooccurrence.objects.bulk_create([
+            TagCooccurrence(tag=tag, related_tag=related_tag, count=1)
+            for related_tag in sorted(related_tags - existing)
+        ])
+
+
+def apply_tag_delta(removed=(), added=()):
+    """게시글 저장/삭제로 빠지거나 추가된 태그만 TagStat에 반영합니다."""
+    if not removed and not added:
+        return
+
+    if removed:
+        TagStat.objects.filter(tag__in=list(removed), post_count__gt=0).update(
+            post_count=F('post_count') - 1,
+        )
+
+    now = timezone.now()
+    for tag in added:
+        stat, created = TagStat.objects.get_or_create(
+            tag=tag,
+            defaults={'post_count': 1, 'last_used': now},
+        )
+        if not created:
+            TagStat.objects.filter(pk=stat.pk).update(
+                post_count=F('post_count') + 1,
+                last_used=now,
+            )
+    invalidate_on_commit(TAG_CACHE_NAMESPACE)
+
+
+def rebuild_tag_stats():
+    """Post.tags 기준으로 PostTag/TagStat/TagCooccurrence를 다시 만들고 태그 수를 반환합니다."""
+    with transaction.atomic():
+        PostTag.objects.all().delete()
+        links = []
+        pair_counts = Counter()
+        for post in Post.objects.only('id', 'tags').iterator():
+            tags = normalize_tags(post.tags)
+            links.extend(PostTag(post_id=post.pk, tag=tag) for tag in tags)
+            pair_counts.update(permutations(tags, 2))
+            if len(links) >= 1000:
+                PostTag.objects.bulk_create(links)
+                links = []
+        PostTag.objects.bulk_create(links)
+
+        TagCooccurrence.objects.all().delete()
+        TagCooccurrence.objects.bulk_create(
+            [
+                TagCooccurrence(tag=tag, related_tag=related_tag, count=count)
+                for (tag, related_tag), count in pair_counts.items()
+            ],
+            batch_size=1000,
+        )
+
+        tag_rows = (
+            PostTag.objects
+            .values('tag')
+            .annotate(post_count=Count('post_id'), last_used=Max('post__updated_at'))
+        )
+        TagStat.objects.all().delete()
+        TagStat.objects.bulk_create([
+            TagStat(tag=row['tag'], post_count=row['post_count'], last_used=row['last_used'])
+            for row in tag_rows
+        ])
+    invalidate_on_commit(TAG_CACHE_NAMESPACE)
+    return len(tag_rows)
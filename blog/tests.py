@@ -1,22 +1,47 @@
+import base64
 import io
 import json
 import os
 import shutil
 import tempfile
+import threading
 import zipfile
 from datetime import timedelta
+from unittest import mock
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.template.loader import render_to_string
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
 from blog import utils
-from blog.models import APIKey, Comment, Post, generate_api_key
+from blog.models import APIKey, Comment, Post, PostTag, TagStat, ThumbnailJob, generate_api_key
+from blog.page_cache import page_cache_key
+from blog.rendering import MarkdownRenderer, renderer
+from blog.pagination import HasNextPaginator, cached_count
+from blog.query_budget import QueryDeadlineExceeded, get_degradation_counts, query_deadline
+from blog.tag_utils import get_cached_tag_counts, get_related_tags, get_sorted_tag_counts
+from blog.thumbnails import THUMBNAIL_JOB_MAX_ATTEMPTS, get_thumbnail_job_stats, process_thumbnail_jobs
 
 
 TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix='test_media_')
+# 캐시 적중 시 DB 질의가 없는지 세는 테스트용 (기본 DB 캐시는 조회도 질의로 셈)
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def set_cookie_middleware(get_response):
+    """뷰 다음에 쿠키를 붙이는 미들웨어를 흉내 내는 테스트용 미들웨어입니다."""
+    def middleware(request):
+        response = get_response(request)
+        response.set_cookie('visitor', '1')
+        return response
+    return middleware
 
 
 def _create_api_key(user, name='test', scope='read', **kwargs):
@@ -70,6 +95,44 @@ class RenderMarkdownTest(TestCase):
         html = utils.render_markdown('<script>alert("xss")</script>')
         self.assertNotIn('<script>', html)
 
+    def test_highlights_fenced_code(self):
+        html = utils.render_markdown('```python\ndef hello():\n    pass\n```')
+        self.assertIn('<div class="codehilite">', html)
+        self.assertIn('<span class="k">def</span>', html)
+
+    def test_highlight_classes_do_not_allow_other_attributes(self):
+        html = utils.render_markdown('<span class="k" onclick="x()">a</span> <p class="k">b</p>')
+        self.assertIn('<span class="k">a</span>', html)
+        self.assertNotIn('onclick', html)
+        self.assertNotIn('<p class', html)
+
+    def test_parser_state_is_reset_between_documents(self):
+        utils.render_markdown('[ref]\n\n[ref]: https://example.com')
+        self.assertNotIn('<a', utils.render_markdown('[ref]'))
+
+    def test_parser_is_reused_per_thread(self):
+        engine = MarkdownRenderer()
+        engine.render('a')
+        parsers = [engine._parser()]
+        thread = threading.Thread(target=lambda: parsers.append(engine._parser()))
+        thread.start()
+        thread.join()
+        self.assertIs(engine._parser(), parsers[0])
+        self.assertIsNot(parsers[0], parsers[1])
+
+    def test_matches_per_call_rendering(self):
+        from blog.management.commands.benchmark_rendering import SAMPLE_DOCUMENT, render_per_call
+        self.assertEqual(utils.render_markdown(SAMPLE_DOCUMENT), render_per_call(SAMPLE_DOCUMENT))
+
+    def test_version_follows_config(self):
+        self.assertEqual(MarkdownRenderer().version, utils.RENDERER_VERSION)
+        self.assertNotEqual(MarkdownRenderer(tags=['p']).version, utils.RENDERER_VERSION)
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command('benchmark_rendering', '--rounds', '1', stdout=out)
+        self.assertIn('렌더링 엔진', out.getvalue())
+
 
 class ExtractThumbnailUrlTest(TestCase):
     def test_with_image(self):
@@ -140,6 +203,27 @@ class ParseSearchExpressionTest(TestCase):
         expr = utils.build_search_expression(['django', 'python'], ['블로그', '구현'])
         self.assertEqual(expr, 'tag:django,python search:블로그,구현')
 
+    def test_fuzzy_marker_requests_fuzzy_search(self):
+        tags, terms, fuzzy, _ = utils.parse_search_query('tag:django fuzzy:쿠버네티즈')
+        self.assertEqual(tags, ['django'])
+        self.assertEqual(terms, ['쿠버네티즈'])
+        self.assertTrue(fuzzy)
+        self.assertEqual(utils.build_search_expression(tags, terms, fuzzy), 'tag:django fuzzy:쿠버네티즈')
+
+    def test_tokenize_search_text_splits_hangul_into_bigrams(self):
+        self.assertEqual(
+            utils.tokenize_search_text('Django로 검색을 구현'),
+            ['django', '로', '검색', '색을', '을', '구현', '현'],
+        )
+
+    def test_plus_prefixed_tag_is_required(self):
+        tags, terms, _, required = utils.parse_search_query('tag:docker,+aws search:배포')
+        self.assertEqual((tags, terms, required), (['docker'], ['배포'], ['aws']))
+        self.assertEqual(utils.build_search_expression(tags, terms, required_tags=required), 'tag:docker,+aws search:배포')
+
+    def test_plain_expression_is_not_fuzzy(self):
+        self.assertFalse(utils.parse_search_query('tag:django search:배포')[2])
+
 
 class RewriteImagePathsTest(TestCase):
     def test_basic_rewrite(self):
@@ -225,6 +309,67 @@ class PostModelTest(TestCase):
         post = _create_post(body_md='**bold** text')
         self.assertIn('<strong>bold</strong>', post.body_html)
 
+    def test_title_edit_skips_rendering(self):
+        post = Post.objects.get(pk=_create_post(body_md='본문').pk)
+        post.title = '새 제목'
+        with mock.patch.object(renderer, 'render_document') as render_document, \
+                mock.patch('blog.tag_utils.sync_post_tags') as sync_post_tags:
+            post.save()
+        render_document.assert_not_called()
+        sync_post_tags.assert_not_called()
+        self.assertTrue(post.search_document.startswith('새 제목\n'))
+
+    def test_body_edit_rerenders(self):
+        post = Post.objects.get(pk=_create_post(body_md='old').pk)
+        post.body_md = '**new**'
+        post.save()
+        self.assertIn('<strong>new</strong>', Post.objects.get(pk=post.pk).body_html)
+
+    def test_unchanged_save_after_load_skips_derived_fields(self):
+        post = Post.objects.get(pk=_create_post().pk)
+        self.assertEqual(post.get_changed_source_fields(), set())
+        post.tags.append('new-tag')
+        self.assertEqual(post.get_changed_source_fields(), {'tags'})
+
+    def test_update_fields_saves_dependent_fields(self):
+        post = Post.objects.get(pk=_create_post(body_md='old').pk)
+        post.summary = '새 요약'
+        post.body_md = '**new**'
+        with mock.patch('blog.search_index.uses_postgres_search', return_value=True), \
+                mock.patch('blog.search_index.weighted_search_vector') as weighted_search_vector, \
+                mock.patch.object(Post.objects, 'filter'):
+            post.save(update_fields=['summary'])
+        # search_vector(PostgreSQL)도 저장된 본문 기준으로 만듦
+        weighted_search_vector.assert_called_once_with('Test Post', '새 요약', 'old')
+        stored = Post.objects.get(pk=post.pk)
+        self.assertIn('새 요약', stored.search_document)
+        self.assertIn('old', stored.search_document)
+        self.assertNotIn('new', stored.body_html)
+        self.assertEqual(post.get_changed_source_fields(), {'body_md'})
+
+    def test_save_builds_doc_meta(self):
+        post = _create_post(body_md='# 소개\n\nDjango로 검색을 구현합니다.\n\n## 설치 방법\n\n![a](/a.png)')
+        self.assertIn('<h1 id="h-소개">', post.body_html)
+        toc = post.doc_meta['toc']
+        self.assertEqual((toc[0]['id'], toc[0]['title']), ('h-소개', '소개'))
+        self.assertEqual(toc[0]['children'][0]['id'], 'h-설치-방법')
+        self.assertEqual(post.doc_meta['word_count'], 6)
+        self.assertEqual(post.doc_meta['image_count'], 1)
+        self.assertEqual(post.doc_meta['reading_minutes'], 1)
+
+    def test_detail_shows_toc(self):
+        _create_post(slug='toc', body_md='# 하나\n\n## 둘\n\n본문')
+        resp = self.client.get(reverse('blog:post_detail', args=['toc']))
+        self.assertContains(resp, '<a href="#h-둘"', html=False)
+        self.assertContains(resp, '1분 읽기')
+
+    def test_detail_serves_highlighted_code_without_script(self):
+        _create_post(slug='code', body_md='```python\nimport os\n```')
+        resp = self.client.get(reverse('blog:post_detail', args=['code']))
+        self.assertContains(resp, '<span class="kn">import</span>')
+        self.assertContains(resp, 'css/pygments.css')
+        self.assertNotContains(resp, 'highlight.min.js')
+
     def test_save_extracts_thumbnail(self):
         post = _create_post(body_md='![img](/media/uploads/test.png)\n\nText')
         self.assertEqual(post.thumbnail_url, '/media/uploads/test.png')
@@ -245,6 +390,168 @@ class PostModelTest(TestCase):
         self.assertEqual(post.tags, ['django', 'python'])
 
 
+class TagStatTest(TestCase):
+    def test_create_increments_counts(self):
+        _create_post(slug='a', tags=['django', 'python'])
+        _create_post(slug='b', tags=['django'])
+        self.assertEqual(get_sorted_tag_counts(), [('django', 2), ('python', 1)])
+
+    def test_edit_applies_only_changed_tags(self):
+        post = _create_post(slug='a', tags=['django', 'python'])
+        post.tags = ['django', 'rust']
+        post.save()
+        self.assertEqual(get_sorted_tag_counts(), [('django', 1), ('rust', 1)])
+
+    def test_bulk_delete_decrements_counts(self):
+        staff = User.objects.create_user('admin', password='pass', is_staff=True)
+        _create_post(slug='a', tags=['django'])
+        _create_post(slug='b', tags=['django', 'python'])
+        self.client.force_login(staff)
+        self.client.post(reverse('blog:post_bulk_delete'), {'slugs': ['a', 'b']})
+        self.assertEqual(get_sorted_tag_counts(), [])
+
+    def test_rebuild_command_repairs_drift(self):
+        _create_post(slug='a', tags=['django'])
+        TagStat.objects.update(post_count=10)
+        TagStat.objects.create(tag='stale', post_count=3)
+        call_command('rebuild_tag_stats', stdout=io.StringIO())
+        self.assertEqual(get_sorted_tag_counts(), [('django', 1)])
+
+    def test_post_tag_links_follow_post_tags(self):
+        post = _create_post(slug='a', tags=['django', 'python'])
+        post.tags = ['python', 'rust']
+        post.save()
+        links = set(PostTag.objects.filter(post=post).values_list('tag', flat=True))
+        self.assertEqual(links, {'python', 'rust'})
+
+    def test_rebuild_command_restores_post_tag_links(self):
+        post = _create_post(slug='a', tags=['django'])
+        PostTag.objects.all().delete()
+        call_command('rebuild_tag_stats', stdout=io.StringIO())
+        self.assertEqual(list(post.tag_links.values_list('tag', flat=True)), ['django'])
+
+
+class RelatedTagsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        _create_post(slug='a', tags=['django', 'python', 'orm'])
+        _create_post(slug='b', tags=['django', 'python'])
+        _create_post(slug='c', tags=['rust'])
+
+    def test_related_tags_ranked_by_cooccurrence(self):
+        self.assertEqual(get_related_tags(['django']), [('python', 2), ('orm', 1)])
+        self.assertEqual(get_related_tags(['rust']), [])
+
+    def test_related_tags_follow_edits_and_deletes(self):
+        post = Post.objects.get(slug='b')
+        post.tags = ['django', 'orm']
+        post.save()
+        self.assertEqual(get_related_tags(['django']), [('orm', 2), ('python', 1)])
+
+        Post.objects.filter(slug='a').delete()
+        self.assertEqual(get_related_tags(['django']), [('orm', 1)])
+
+    def test_list_view_exposes_related_tags(self):
+        resp = self.client.get(reverse('blog:post_list'), {'tag': 'python'})
+        related = [(item['tag'], item['count'], item['query_expr']) for item in resp.context['related_tags']]
+        self.assertEqual(related, [('django', 2, 'tag:python,+django'), ('orm', 1, 'tag:python,+orm')])
+
+    def test_related_tag_link_narrows_results(self):
+        _create_post(slug='d', tags=['python'])
+        resp = self.client.get(reverse('blog:post_list'), {'q': 'tag:python,+orm'})
+        self.assertEqual([post.slug for post in resp.context['page_obj']], ['a'])
+        self.assertEqual([item['tag'] for item in resp.context['related_tags']], ['django'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class NavbarTagContextTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_without_tags_skip_tag_lookup(self):
+        _create_post(slug='a', tags=['django'])
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse('blog:api_guide'))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_cached_tag_list_is_invalidated_on_post_write(self):
+        _create_post(slug='a', tags=['django'])
+        self.assertEqual(get_cached_tag_counts(), [('django', 1)])
+        with self.assertNumQueries(0):
+            get_cached_tag_counts()
+
+        _create_post(slug='b', tags=['python'])
+        resp = self.client.get(reverse('blog:post_list'))
+        self.assertEqual(resp.context['navbar_top_tags'](), [('django', 1), ('python', 1)])
+
+
+class TagSuggestViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        _create_post(slug='a', tags=['django', 'docker', '파이썬'])
+        _create_post(slug='b', tags=['docker', '파이프라인'])
+        _create_post(slug='c', tags=['docker'])
+
+    def _suggest(self, **params):
+        resp = self.client.get(reverse('blog:tag_suggest'), params)
+        self.assertEqual(resp.status_code, 200)
+        return [(item['tag'], item['count']) for item in resp.json()['tags']]
+
+    def test_prefix_matches_ordered_by_frequency(self):
+        self.assertEqual(self._suggest(q='D'), [('docker', 3), ('django', 1)])
+
+    def test_korean_prefix(self):
+        self.assertEqual(self._suggest(q='파이'), [('파이썬', 1), ('파이프라인', 1)])
+
+    def test_invalid_prefix_returns_nothing(self):
+        self.assertEqual(self._suggest(q='do!'), [])
+
+    def test_index_is_rebuilt_after_tag_change(self):
+        self.assertEqual(self._suggest(q='r'), [])
+        _create_post(slug='d', tags=['rust'])
+        self.assertEqual(self._suggest(q='r'), [('rust', 1)])
+
+    def test_list_page_does_not_embed_all_tags(self):
+        resp = self.client.get(reverse('blog:post_list'))
+        self.assertNotContains(resp, 'navbar-tag-items-data')
+
+
+class PostSuggestViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        _create_post(slug='old', title='Django 검색 구현', created_at=now - timedelta(days=2))
+        _create_post(slug='new', title='도커로 Django 배포', created_at=now)
+
+    def _suggest(self, **params):
+        resp = self.client.get(reverse('blog:post_suggest'), params)
+        self.assertEqual(resp.status_code, 200)
+        return [item['slug'] for item in resp.json()['posts']]
+
+    def test_word_prefix_matches_newest_first(self):
+        self.assertEqual(self._suggest(q='dja'), ['new', 'old'])
+        self.assertEqual(self._suggest(q='검'), ['old'])
+        self.assertEqual(self._suggest(q='dja', limit=1), ['new'])
+
+    def test_repeated_word_does_not_crowd_out_other_posts(self):
+        _create_post(slug='echo', title='Django django django django')
+        self.assertEqual(self._suggest(q='dja', limit=2), ['echo', 'new'])
+
+    def test_empty_prefix_returns_nothing(self):
+        self.assertEqual(self._suggest(q=' '), [])
+
+    def test_index_follows_edit_and_delete(self):
+        self.assertEqual(self._suggest(q='도커'), ['new'])
+        post = Post.objects.get(slug='new')
+        post.title = '쿠버네티스 배포'
+        post.save()
+        self.assertEqual(self._suggest(q='도커'), [])
+        self.assertEqual(self._suggest(q='쿠버'), ['new'])
+
+        post.delete()
+        self.assertEqual(self._suggest(q='배포'), [])
+
+
 # ──────────────────────────────────────────────
 # 통합 테스트: process_uploaded_md / process_uploaded_zip
 # ──────────────────────────────────────────────
@@ -595,6 +902,12 @@ class PostListViewTest(TestCase):
             body_md='운영 배포 체크리스트',
         )
 
+    def test_list_reads_card_columns_only(self):
+        for params in ({}, {'q': '검색'}):
+            resp = self.client.get(reverse('blog:post_list'), params)
+            for post in resp.context['page_obj']:
+                self.assertTrue({'body_md', 'body_html', 'search_document'} <= post.get_deferred_fields())
+
     def test_search_query_filters_by_title_or_body(self):
         resp = self.client.get(reverse('blog:post_list'), {'q': '검색'})
         self.assertEqual(resp.status_code, 200)
@@ -649,11 +962,434 @@ class PostListViewTest(TestCase):
         self.assertEqual(resp.context['current_search_terms'], [])
 
 
+class FullTextSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _search(self, q):
+        resp = self.client.get(reverse('blog:post_list'), {'q': q})
+        self.assertEqual(resp.status_code, 200)
+        return [p.slug for p in resp.context['page_obj']]
+
+    def test_ranked_by_relevance(self):
+        _create_post(slug='once', title='배포 노트', body_md='다른 이야기', tags=[])
+        _create_post(
+            slug='many', title='쿠버네티스 배포', summary='배포 자동화',
+            body_md='배포 배포 배포', tags=[], created_at=timezone.now() - timedelta(days=3),
+        )
+        self.assertEqual(self._search('배포'), ['many', 'once'])
+
+    def test_korean_particle_is_matched_by_prefix(self):
+        _create_post(slug='particle', title='노트', body_md='검색을 지원합니다.', tags=[])
+        self.assertEqual(self._search('검색'), ['particle'])
+
+    def test_index_follows_edit_and_delete(self):
+        post = _create_post(slug='edit', title='초안', body_md='본문', tags=[])
+        post.body_md = '수정된 내용'
+        post.save()
+        self.assertEqual(self._search('초안'), ['edit'])
+        self.assertEqual(self._search('본문'), [])
+        self.assertEqual(self._search('수정된'), ['edit'])
+
+        post.delete()
+        self.assertEqual(self._search('수정된'), [])
+
+    def test_korean_substring_is_matched_by_bigrams(self):
+        _create_post(slug='compound', title='노트', body_md='전문검색엔진을 만들었습니다.', tags=[])
+        self.assertEqual(self._search('검색엔진'), ['compound'])
+        self.assertEqual(self._search('엔진 만들'), [])
+
+    def test_single_syllable_at_end_of_word_is_matched(self):
+        _create_post(slug='book', title='동화책 추천', body_md='본문', tags=[])
+        _create_post(slug='check', title='시스템 점검 안내', body_md='본문', tags=[])
+        self.assertEqual(self._search('책'), ['book'])
+        self.assertEqual(self._search('검'), ['check'])
+
+    def test_result_ids_are_cached_until_post_write(self):
+        post = _create_post(slug='cached', title='캐시 노트', body_md='본문', tags=[])
+        self.assertEqual(self._search('캐시'), ['cached'])
+
+        # 신호 없이 바뀐 행은 캐시된 id 목록을 그대로 쓰되 페이지 행은 새로 읽음
+        Post.objects.filter(pk=post.pk).update(title='바뀐 제목')
+        resp = self.client.get(reverse('blog:post_list'), {'q': 'search:캐시'})
+        self.assertEqual([p.title for p in resp.context['page_obj']], ['바뀐 제목'])
+
+        _create_post(slug='cached-2', title='캐시 두번째', body_md='본문', tags=[])
+        self.assertEqual(sorted(self._search('캐시')), ['cached', 'cached-2'])
+
+    def test_tag_facets_count_within_search_results(self):
+        _create_post(slug='a', title='배포 노트', tags=['docker', 'aws'])
+        _create_post(slug='b', title='배포 회고', tags=['docker'])
+        _create_post(slug='c', title='다른 글', tags=['docker', 'rust'])
+        resp = self.client.get(reverse('blog:post_list'), {'q': '배포'})
+        facets = [(f['tag'], f['count'], f['query_expr']) for f in resp.context['tag_facets']]
+        self.assertEqual(facets, [('docker', 2, 'tag:+docker search:배포'), ('aws', 1, 'tag:+aws search:배포')])
+
+    def test_tag_facet_narrows_selected_tags(self):
+        _create_post(slug='a', title='배포 노트', tags=['docker', 'aws'])
+        _create_post(slug='b', title='배포 회고', tags=['docker'])
+        _create_post(slug='d', title='배포 정리', tags=['aws'])
+        resp = self.client.get(reverse('blog:post_list'), {'q': 'tag:docker search:배포'})
+        facet = resp.context['tag_facets'][0]
+        self.assertEqual((facet['tag'], facet['count'], facet['query_expr']), ('aws', 1, 'tag:docker,+aws search:배포'))
+
+        # 링크는 현재 태그를 유지한 채 좁히므로 개수와 결과가 같음
+        self.assertEqual(self._search(facet['query_expr']), ['a'])
+        self.assertEqual(resp.context['current_tags'], ['docker'])
+
+    def test_term_without_tokens_falls_back_to_substring(self):
+        _create_post(slug='symbols', title='C++ 메모', body_md='연산자 ++ 정리', tags=[])
+        self.assertEqual(self._search('++'), ['symbols'])
+
+
+class SearchQueryBudgetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_long_query_is_interrupted(self):
+        with self.assertRaises(QueryDeadlineExceeded):
+            with query_deadline(20), connection.cursor() as cursor:
+                cursor.execute(
+                    'WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) '
+                    'SELECT COUNT(*) FROM c'
+                )
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_degraded_search_falls_back_to_title_match(self):
+        _create_post(slug='title-hit', title='배포 노트', body_md='본문', tags=[])
+        _create_post(slug='body-hit', title='노트', body_md='배포 이야기', tags=[])
+        with mock.patch('blog.views._search_post_ids', side_effect=QueryDeadlineExceeded), \
+                self.assertLogs('blog.query_budget', 'WARNING'):
+            resp = self.client.get(reverse('blog:post_list'), {'q': '배포'})
+        self.assertTrue(resp.context['search_degraded'])
+        self.assertContains(resp, '검색이 오래 걸려')
+        self.assertEqual([p.slug for p in resp.context['page_obj']], ['title-hit'])
+        self.assertEqual(get_degradation_counts()['search'], 1)
+
+    def test_degraded_search_prefers_previous_result(self):
+        _create_post(slug='body-hit', title='노트', body_md='배포 이야기', tags=[])
+        self.client.get(reverse('blog:post_list'), {'q': '배포'})
+        _create_post(slug='other', title='다른 글', tags=[])
+
+        with mock.patch('blog.views._search_post_ids', side_effect=QueryDeadlineExceeded), \
+                self.assertLogs('blog.query_budget', 'WARNING'):
+            resp = self.client.get(reverse('blog:post_list'), {'q': '배포'})
+        self.assertTrue(resp.context['search_degraded'])
+        self.assertEqual([p.slug for p in resp.context['page_obj']], ['body-hit'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PaginationCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        for i in range(3):
+            _create_post(slug=f'p{i}', created_at=now - timedelta(days=i))
+
+    def test_cached_count_until_post_write(self):
+        self.assertEqual(cached_count(Post.objects.all(), 'all'), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(Post.objects.all(), 'all'), 3)
+        _create_post(slug='p3')
+        self.assertEqual(cached_count(Post.objects.all(), 'all'), 4)
+
+    def test_has_next_paginator_skips_count(self):
+        paginator = HasNextPaginator(Post.objects.order_by('-created_at'), 2)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(1)
+            self.assertEqual([p.slug for p in page], ['p0', 'p1'])
+            self.assertTrue(page.has_next())
+            self.assertEqual(paginator.num_pages, 2)
+
+        page = paginator.get_page(2)
+        self.assertEqual([p.slug for p in page], ['p2'])
+        self.assertFalse(page.has_next())
+        self.assertEqual(paginator.get_page(9).number, 1)
+
+    @override_settings(PAGINATION_COUNT_STRATEGIES={'post_list': 'has_next'})
+    def test_post_list_has_next_mode(self):
+        resp = self.client.get(reverse('blog:post_list'), {'per_page': 10})
+        self.assertEqual(len(resp.context['page_obj']), 3)
+        self.assertFalse(resp.context['page_obj'].has_next())
+
+
 # ──────────────────────────────────────────────
-# API 엔드포인트 테스트
+# 캐시 / 조건부 요청 테스트
 # ──────────────────────────────────────────────
 
 @override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pass')
+        self.post = _create_post(slug='cached', title='캐시 글', tags=['python'])
+        self.other = _create_post(slug='other', title='다른 글', tags=['django'])
+
+    def test_anonymous_detail_is_cached(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        resp = self.client.get(url)
+        self.assertEqual(resp['X-Page-Cache'], 'HIT')
+        self.assertContains(resp, '캐시 글')
+
+    def test_response_with_cookie_from_middleware_is_not_cached(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        # 세션/메시지처럼 뷰 데코레이터 이후에 붙는 쿠키도 보고 캐시하지 않음
+        middleware = list(settings.MIDDLEWARE)
+        middleware.insert(1, 'blog.tests.set_cookie_middleware')
+        with self.settings(MIDDLEWARE=middleware):
+            resp = self.client.get(url)
+        self.assertIn('visitor', resp.cookies)
+        self.assertNotIn('X-Page-Cache', resp)
+        # 쿠키를 붙이지 않는 요청은 캐시된 페이지 없이 새로 렌더링
+        self.assertEqual(self.client_class().get(url)['X-Page-Cache'], 'MISS')
+
+    def test_logged_in_user_is_not_cached(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        self.client.get(url)
+        self.client.force_login(self.user)
+        self.assertNotIn('X-Page-Cache', self.client.get(url))
+
+    def test_query_string_is_normalized(self):
+        url = reverse('blog:post_list')
+        self.client.get(url + '?tag=python&per_page=20')
+        resp = self.client.get(url + '?per_page=20&tag=python&q=')
+        self.assertEqual(resp['X-Page-Cache'], 'HIT')
+
+    def test_comment_purges_only_its_post(self):
+        cached_url = reverse('blog:post_detail', args=['cached'])
+        other_url = reverse('blog:post_detail', args=['other'])
+        self.client.get(cached_url)
+        self.client.get(other_url)
+        Comment.objects.create(post=self.post, user=self.user, content='새 댓글')
+
+        resp = self.client.get(cached_url)
+        self.assertEqual(resp['X-Page-Cache'], 'MISS')
+        self.assertContains(resp, '새 댓글')
+        self.assertEqual(self.client.get(other_url)['X-Page-Cache'], 'HIT')
+
+    def test_post_edit_purges_pages_showing_it(self):
+        list_url = reverse('blog:post_list')
+        self.client.get(list_url)
+        self.client.get(list_url, {'tag': 'django'})
+        self.post.title = '고친 제목'
+        self.post.save()
+
+        resp = self.client.get(list_url)
+        self.assertEqual(resp['X-Page-Cache'], 'MISS')
+        self.assertContains(resp, '고친 제목')
+        self.assertEqual(self.client.get(list_url, {'tag': 'django'})['X-Page-Cache'], 'HIT')
+
+    def test_new_post_purges_tag_page(self):
+        list_url = reverse('blog:post_list')
+        self.client.get(list_url, {'tag': 'django'})
+        _create_post(slug='new', title='새 글', tags=['django'])
+        resp = self.client.get(list_url, {'tag': 'django'})
+        self.assertEqual(resp['X-Page-Cache'], 'MISS')
+        self.assertContains(resp, '새 글')
+
+    def test_concurrent_miss_serves_previous_page_while_rendering(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        resp = self.client.get(url)
+        Comment.objects.create(post=self.post, user=self.user, content='새 댓글')
+
+        key = page_cache_key(resp.wsgi_request)
+        cache.add(f'{key}:lock', 1)
+        resp = self.client.get(url)
+        self.assertEqual(resp['X-Page-Cache'], 'STALE')
+        self.assertNotContains(resp, '새 댓글')
+
+
+class PostCardFragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pass')
+        self.client.force_login(self.user)
+        self.post = _create_post(slug='first', title='첫 글')
+        _create_post(slug='second', title='둘째 글')
+
+    def test_cards_are_rendered_once(self):
+        with mock.patch('blog.fragments.render_to_string', wraps=render_to_string) as render_card:
+            self.client.get(reverse('blog:post_list'))
+            self.assertEqual(render_card.call_count, 2)
+            resp = self.client.get(reverse('blog:post_list'))
+            self.assertEqual(render_card.call_count, 2)
+        self.assertContains(resp, '첫 글')
+        self.assertContains(resp, '둘째 글')
+
+    def test_edited_post_card_is_rerendered(self):
+        self.client.get(reverse('blog:post_list'))
+        self.post.title = '고친 제목'
+        self.post.save()
+        with mock.patch('blog.fragments.render_to_string', wraps=render_to_string) as render_card:
+            resp = self.client.get(reverse('blog:post_list'))
+        self.assertEqual(render_card.call_count, 1)
+        self.assertContains(resp, '고친 제목')
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pass')
+        self.post = _create_post(slug='cached', title='캐시 글')
+
+    def test_post_detail_returns_304_until_changed(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        resp = self.client.get(url)
+        self.assertTrue(resp['ETag'].startswith('"'))
+        self.assertIn('no-cache', resp['Cache-Control'])
+        etag = resp['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Comment.objects.create(post=self.post, user=self.user, content='새 댓글')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_post_detail_etag_differs_per_user(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_post_detail_ignores_if_modified_since(self):
+        url = reverse('blog:post_detail', args=['cached'])
+        self.assertNotIn('Last-Modified', self.client.get(url))
+        # 로그인 후 화면이 달라지므로 날짜만으로 304를 주지 않음
+        self.client.force_login(self.user)
+        since = 'Fri, 31 Dec 2100 00:00:00 GMT'
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_api_post_list_etag_changes_on_write(self):
+        _, raw_key = _create_api_key(self.user)
+        auth = f'Key {raw_key}'
+        etag = self.client.get('/api/posts/', HTTP_AUTHORIZATION=auth)['ETag']
+        resp = self.client.get('/api/posts/', HTTP_AUTHORIZATION=auth, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        _create_post(slug='new', title='새 글')
+        resp = self.client.get('/api/posts/', HTTP_AUTHORIZATION=auth, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+
+# ──────────────────────────────────────────────
+# 관리 명령 / 작업 큐 테스트
+# ──────────────────────────────────────────────
+
+class RerenderPostsCommandTest(TestCase):
+    def setUp(self):
+        self.python = _create_post(slug='py', tags=['python'], body_md='**굵게**')
+        self.django = _create_post(slug='dj', tags=['django'], body_md='*기울임*')
+        Post.objects.update(body_html='<p>old</p>', body_html_version='')
+
+    def _rerender(self, *args):
+        out = io.StringIO()
+        call_command('rerender_posts', '--workers', '1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_rerenders_stale_posts(self):
+        output = self._rerender('--stale', '--chunk-size', '1')
+        self.assertIn('게시글 2건', output)
+        post = Post.objects.get(slug='py')
+        self.assertEqual(post.body_html, '<p><strong>굵게</strong></p>')
+        self.assertEqual(post.body_html_version, utils.RENDERER_VERSION)
+        self.assertIn('게시글 0건', self._rerender('--stale'))
+
+    def test_tag_filter(self):
+        self._rerender('--tag', 'django')
+        self.assertEqual(Post.objects.get(slug='py').body_html, '<p>old</p>')
+        self.assertEqual(Post.objects.get(slug='dj').body_html, '<p><em>기울임</em></p>')
+
+    def test_process_pool(self):
+        out = io.StringIO()
+        call_command('rerender_posts', '--workers', '2', stdout=out)
+        self.assertEqual(Post.objects.get(slug='dj').body_html, '<p><em>기울임</em></p>')
+
+    def test_save_records_renderer_version(self):
+        self.assertEqual(_create_post(slug='new').body_html_version, utils.RENDERER_VERSION)
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class ThumbnailJobTest(TestCase):
+    def setUp(self):
+        from PIL import Image
+
+        uploads = os.path.join(TEST_MEDIA_ROOT, 'uploads')
+        os.makedirs(uploads, exist_ok=True)
+        Image.new('RGB', (1600, 900), 'white').save(os.path.join(uploads, 'queue.png'))
+        self.thumbnails_dir = os.path.join(TEST_MEDIA_ROOT, 'thumbnails')
+        self.addCleanup(shutil.rmtree, self.thumbnails_dir, ignore_errors=True)
+        with mock.patch('blog.thumbnails.create_thumbnail_file') as create_thumbnail_file:
+            self.post = _create_post(slug='thumb', body_md='![대표](/media/uploads/queue.png)')
+        create_thumbnail_file.assert_not_called()
+
+    def test_save_keeps_original_url_and_enqueues_job(self):
+        # 저장 중에는 파일을 만들지 않고 작업만 넣음
+        self.assertFalse(os.path.exists(self.thumbnails_dir))
+        self.assertEqual(self.post.thumbnail_url, '/media/uploads/queue.png')
+        job = ThumbnailJob.objects.get(post=self.post)
+        self.assertEqual((job.status, job.source_url), ('pending', '/media/uploads/queue.png'))
+
+    def test_worker_replaces_thumbnail_url(self):
+        call_command('thumbnail_worker', '--once', stdout=io.StringIO())
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.thumbnail_url.startswith('/media/thumbnails/'))
+        job = ThumbnailJob.objects.get(post=self.post)
+        self.assertEqual((job.status, job.attempts), ('done', 1))
+        self.assertIsNotNone(job.duration_ms)
+        self.assertEqual(get_thumbnail_job_stats()['counts']['done'], 1)
+
+        # 같은 이미지로 다시 저장하면 이미 만든 썸네일을 바로 씀
+        self.post.body_md += '\n\n추가 문단'
+        self.post.save()
+        self.assertTrue(self.post.thumbnail_url.startswith('/media/thumbnails/'))
+        self.assertFalse(ThumbnailJob.objects.filter(status='pending').exists())
+
+    def test_failed_job_retries_with_backoff(self):
+        with mock.patch('blog.thumbnails.create_thumbnail_file', side_effect=OSError('broken')):
+            self.assertEqual(process_thumbnail_jobs(), (0, 1))
+            job = ThumbnailJob.objects.get(post=self.post)
+            self.assertEqual((job.status, job.attempts), ('pending', 1))
+            self.assertIn('broken', job.last_error)
+            self.assertGreater(job.run_after, timezone.now())
+            # 백오프 중에는 다시 가져가지 않음
+            self.assertEqual(process_thumbnail_jobs(), (0, 0))
+
+            for _ in range(THUMBNAIL_JOB_MAX_ATTEMPTS - 1):
+                ThumbnailJob.objects.update(run_after=timezone.now())
+                process_thumbnail_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', THUMBNAIL_JOB_MAX_ATTEMPTS))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.thumbnail_url, '/media/uploads/queue.png')
+
+    def _delete_post_while_running(self, error=None):
+        def side_effect(*args):
+            Post.objects.filter(pk=self.post.pk).delete()
+            if error:
+                raise error
+
+        with mock.patch('blog.thumbnails.create_thumbnail_file', side_effect=side_effect):
+            self.assertEqual(process_thumbnail_jobs(), (1, 0))
+        # 사라진 작업 행을 다시 INSERT하지 않음 (없는 post_id를 가리키는 행이 남지 않음)
+        self.assertFalse(ThumbnailJob.objects.exists())
+        connection.check_constraints()
+
+    def test_post_deleted_during_job_is_not_reinserted(self):
+        self._delete_post_while_running()
+
+    def test_post_deleted_during_failed_job_is_not_reinserted(self):
+        self._delete_post_while_running(OSError('broken'))
+
+    def test_body_change_replaces_pending_job(self):
+        self.post.body_md = '이미지 없음'
+        self.post.save()
+        self.assertEqual(self.post.thumbnail_url, '')
+        self.assertFalse(ThumbnailJob.objects.exists())
+
+
+# ──────────────────────────────────────────────
+# API 엔드포인트 테스트
+# ──────────────────────────────────────────────
+
 class APIPostListTest(TestCase):
     def setUp(self):
         Post.objects.all().delete()
@@ -682,11 +1418,77 @@ class APIPostListTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.json()['posts']), 0)
 
+    def test_list_posts_tag_filter_paginates_in_database(self):
+        _create_post(slug='second', tags=['python'], created_at=timezone.now() - timedelta(days=1))
+        resp = self.client.get(
+            '/api/posts/?tag=python&per_page=1&page=2',
+            HTTP_AUTHORIZATION=f'Key {self.raw_key}',
+        )
+        data = resp.json()
+        self.assertEqual([p['slug'] for p in data['posts']], ['second'])
+        self.assertEqual(data['pagination']['total'], 2)
+
     def test_list_posts_tag_filter_is_case_insensitive(self):
         resp = self.client.get('/api/posts/?tag=PYTHON', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.json()['posts']), 1)
 
+    def test_list_posts_cursor_pagination(self):
+        created_at = timezone.now() - timedelta(days=1)
+        # created_at이 같은 글도 id로 이어서 빠짐없이 읽혀야 함
+        _create_post(slug='second', created_at=created_at)
+        _create_post(slug='third', created_at=created_at)
+        slugs = []
+        cursor = ''
+        while cursor is not None:
+            resp = self.client.get(
+                '/api/posts/', {'cursor': cursor, 'per_page': 2},
+                HTTP_AUTHORIZATION=f'Key {self.raw_key}',
+            )
+            data = resp.json()
+            self.assertNotIn('total', data['pagination'])
+            slugs.extend(p['slug'] for p in data['posts'])
+            cursor = data['next_cursor']
+        self.assertEqual(slugs, ['test-post', 'third', 'second'])
+
+    @override_settings(PAGINATION_COUNT_STRATEGIES={'api_post_list': 'has_next'})
+    def test_list_posts_has_next_mode_omits_total(self):
+        _create_post(slug='second', created_at=timezone.now() - timedelta(days=1))
+        resp = self.client.get('/api/posts/?per_page=1', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+        data = resp.json()
+        self.assertEqual(data['pagination'], {'page': 1, 'per_page': 1, 'has_next': True})
+
+        resp = self.client.get('/api/posts/?per_page=1&page=3', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+        self.assertEqual(resp.json()['posts'], [])
+
+    def test_list_posts_invalid_cursor(self):
+        resp = self.client.get('/api/posts/?cursor=%%%', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_list_posts_out_of_range_cursor(self):
+        payloads = (
+            ['2024-01-01T00:00:00+00:00', 10 ** 30],
+            ['9999-12-31T23:59:59-23:00', 1],
+            ['2024-01-01T00:00:00', 1],
+            ['2024-01-01T00:00:00+00:00', 0],
+        )
+        for payload in payloads:
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            resp = self.client.get('/api/posts/', {'cursor': cursor}, HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+            self.assertEqual(resp.status_code, 400, payload)
+
+    def test_list_posts_facets_count_tags_within_results(self):
+        _create_post(slug='second', tags=['python', 'django'])
+        _create_post(slug='third', tags=['rust'])
+        resp = self.client.get('/api/posts/?tag=python&facets=1', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+        self.assertEqual(resp.json()['facets'], [
+            {'tag': 'python', 'count': 2},
+            {'tag': 'django', 'count': 1},
+        ])
+
+        resp = self.client.get('/api/posts/', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
+        self.assertNotIn('facets', resp.json())
+
 
 @override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
 class APIPostDetailTest(TestCase):
@@ -701,12 +1503,27 @@ class APIPostDetailTest(TestCase):
         data = resp.json()
         self.assertEqual(data['title'], 'My Post')
         self.assertIn('body', data)
+        self.assertEqual(data['meta']['word_count'], 2)
         self.assertIn('comments', data)
 
     def test_not_found(self):
         resp = self.client.get('/api/posts/nonexistent/', HTTP_AUTHORIZATION=f'Key {self.raw_key}')
         self.assertEqual(resp.status_code, 404)
 
+    def test_conditional_get(self):
+        auth = f'Key {self.raw_key}'
+        resp = self.client.get('/api/posts/my-post/', HTTP_AUTHORIZATION=auth)
+        self.assertIn('Last-Modified', resp)
+        etag = resp['ETag']
+
+        resp = self.client.get('/api/posts/my-post/', HTTP_AUTHORIZATION=auth, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        Comment.objects.create(post=Post.objects.get(slug='my-post'), user=self.user, content='댓글')
+        resp = self.client.get('/api/posts/my-post/', HTTP_AUTHORIZATION=auth, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json()['comments']), 1)
+
 
 class APICommentTest(TestCase):
     def setUp(self):
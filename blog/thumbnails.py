@@ -0,0 +1,140 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+
+from .cache_utils import POST_CACHE_NAMESPACE, invalidate_on_commit
+from .models import Post, ThumbnailJob
+from .page_cache import post_surrogate, purge_page_surrogates
+from .utils import create_thumbnail_file, thumbnail_target
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_JOB_MAX_ATTEMPTS = 5
+# 재시도 대기 시간: 30초, 1분, 2분, ... (시도마다 두 배)
+THUMBNAIL_JOB_RETRY_BASE = timedelta(seconds=30)
+# 처리 중 상태로 이 시간이 지난 작업은 워커가 죽은 것으로 보고 다시 가져감
+THUMBNAIL_JOB_LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def initial_thumbnail_url(image_url):
+    """저장 시점에 쓸 thumbnail_url과 썸네일 작업이 필요한지를 (URL, 필요 여부)로 반환합니다.
+
+    썸네일 파일이 이미 있으면 그 URL을, 만들어야 하면 완료될 때까지 원본 URL을 씁니다.
+    """
+    if not image_url:
+        return '', False
+    target = thumbnail_target(image_url)
+    if target is None:
+        return image_url, False
+    _, thumb_path, thumb_url = target
+    if thumb_path.is_file():
+        return thumb_url, False
+    return image_url, True
+
+
+def enqueue_thumbnail(post, image_url):
+    """게시글의 처리 전 작업을 지우고, image_url이 있으면 썸네일 작업을 새로 넣습니다."""
+    ThumbnailJob.objects.filter(post=post, status__in=['pending', 'failed']).delete()
+    if image_url:
+        ThumbnailJob.objects.create(post=post, source_url=image_url)
+
+
+def claim_next_job():
+    """실행할 수 있는 작업 하나를 처리 중으로 바꿔 가져옵니다. 없으면 None입니다.
+
+    상태와 잠금 시각이 그대로일 때만 갱신하는 조건부 UPDATE로 가져가므로 여러 워커가
+    동시에 돌아도 한 작업은 한 워커만 처리합니다.
+    """
+    now = timezone.now()
+    claimable = (
+        Q(status='pending', run_after__lte=now)
+        | Q(status='running', locked_at__lt=now - THUMBNAIL_JOB_LOCK_TIMEOUT)
+    )
+    for job in ThumbnailJob.objects.filter(claimable).order_by('run_after', 'id')[:10]:
+        claimed = ThumbnailJob.objects.filter(
+            pk=job.pk, status=job.status, locked_at=job.locked_at,
+        ).update(status='running', locked_at=now)
+        if claimed:
+            job.status, job.locked_at = 'running', now
+            return job
+    return None
+
+
+def _update_job(job, *fields):
+    # save()는 처리 중 글이 지워져 CASCADE로 사라진 작업 행을 다시 INSERT하므로 UPDATE만 함
+    # (행이 없으면 더 할 일이 없는 것으로 보고 0건 갱신으로 끝냄)
+    return ThumbnailJob.objects.filter(pk=job.pk).update(**{name: getattr(job, name) for name in fields})
+
+
+def run_job(job):
+    """썸네일을 만들고 게시글의 thumbnail_url을 바꿉니다. 실패하면 백오프 후 재시도하도록 되돌립니다."""
+    started = time.monotonic()
+    job.attempts += 1
+    try:
+        target = thumbnail_target(job.source_url)
+        if target is None:
+            raise FileNotFoundError(job.source_url)
+        source_path, thumb_path, thumb_url = target
+        if not thumb_path.is_file():
+            create_thumbnail_file(source_path, thumb_path)
+    except Exception as exc:
+        job.duration_ms = int((time.monotonic() - started) * 1000)
+        job.last_error = f'{type(exc).__name__}: {exc}'
+        job.locked_at = None
+        if job.attempts >= THUMBNAIL_JOB_MAX_ATTEMPTS:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+        else:
+            job.status = 'pending'
+            job.run_after = timezone.now() + THUMBNAIL_JOB_RETRY_BASE * 2 ** (job.attempts - 1)
+        if not _update_job(job, 'status', 'attempts', 'last_error', 'locked_at', 'run_after', 'finished_at', 'duration_ms'):
+            return True
+        logger.warning('Thumbnail job %s failed (attempt %d): %s', job.pk, job.attempts, job.last_error)
+        return False
+
+    with transaction.atomic():
+        # 그사이 본문이 바뀌어 다른 이미지를 쓰게 된 글은 건드리지 않음
+        updated = Post.objects.filter(pk=job.post_id, thumbnail_url=job.source_url).update(
+            thumbnail_url=thumb_url, updated_at=timezone.now(),
+        )
+        if updated:
+            invalidate_on_commit(POST_CACHE_NAMESPACE)
+            purge_page_surrogates(post_surrogate(job.post_id))
+        job.status = 'done'
+        job.last_error = ''
+        job.locked_at = None
+        job.finished_at = timezone.now()
+        job.duration_ms = int((time.monotonic() - started) * 1000)
+        _update_job(job, 'status', 'attempts', 'last_error', 'locked_at', 'finished_at', 'duration_ms')
+    return True
+
+
+def process_thumbnail_jobs(limit=None):
+    """대기 중인 작업을 차례로 처리하고 (성공, 실패) 건수를 반환합니다."""
+    succeeded = failed = 0
+    while limit is None or succeeded + failed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        if run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def get_thumbnail_job_stats():
+    """상태별 작업 수와 완료된 작업의 평균/최대 처리 시간(ms)을 반환합니다."""
+    counts = dict(ThumbnailJob.objects.values_list('status').annotate(count=Count('id')).order_by())
+    timing = ThumbnailJob.objects.filter(status='done').aggregate(
+        avg_ms=Avg('duration_ms'), max_ms=Max('duration_ms'),
+    )
+    return {
+        'counts': {status: counts.get(status, 0) for status, _ in ThumbnailJob.STATUS_CHOICES},
+        'avg_ms': timing['avg_ms'],
+        'max_ms': timing['max_ms'],
+    }
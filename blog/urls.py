@@ -12,6 +12,8 @@ urlpatterns = [
     path('upload-image/', views.upload_image, name='upload_image'),
     path('upload-post/', views.post_upload, name='post_upload'),
     path('delete-posts/', views.post_bulk_delete, name='post_bulk_delete'),
+    path('tags/suggest/', views.tag_suggest, name='tag_suggest'),
+    path('posts/suggest/', views.post_suggest, name='post_suggest'),
     re_path(rf'post/{_SLUG}/edit/$', views.post_edit, name='post_edit'),
     re_path(rf'post/{_SLUG}/$', views.post_detail, name='post_detail'),
     re_path(rf'post/{_SLUG}/comment/$', views.comment_create, name='comment_create'),
@@ -4,45 +4,21 @@ import re
 import uuid
 import zipfile
 
-import bleach
 import yaml
-import markdown
 from datetime import datetime, date
 from pathlib import Path
 
 from django.conf import settings
 from django.utils import timezone
 
+# 렌더러 설정/엔진은 blog.rendering에 있으며 기존 import 경로를 위해 다시 내보냄
+from .rendering import (  # noqa: F401
+    ALLOWED_ATTRIBUTES, ALLOWED_PROTOCOLS, ALLOWED_TAGS, MARKDOWN_EXTENSION_CONFIGS, MARKDOWN_EXTENSIONS,
+    render_markdown, renderer,
+)
 
-ALLOWED_TAGS = [
-    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-    'a', 'img', 'ul', 'ol', 'li',
-    'code', 'pre', 'blockquote',
-    'table', 'thead', 'tbody', 'tr', 'th', 'td',
-    'em', 'strong', 'br', 'hr', 'div', 'span',
-]
-ALLOWED_ATTRIBUTES = {
-    'a': ['href', 'title'],
-    'img': ['src', 'alt', 'title'],
-    'code': ['class'],
-}
-ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
-
-
-def _sanitize_html(html):
-    """Markdown 렌더링 결과에서 허용된 태그/속성만 남기고 제거합니다."""
-    return bleach.clean(
-        html,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        protocols=ALLOWED_PROTOCOLS,
-    )
-
-
-def render_markdown(body_md):
-    """마크다운 텍스트를 sanitized HTML로 변환합니다."""
-    html = markdown.markdown(body_md, extensions=['fenced_code', 'tables'])
-    return _sanitize_html(html)
+# 저장된 body_html을 만든 렌더러 버전 — 허용 태그나 확장이 바뀌면 달라져 다시 렌더링할 글을 찾을 수 있음
+RENDERER_VERSION = renderer.version
 
 
 def extract_thumbnail_url(body_md):
@@ -53,45 +29,41 @@ def extract_thumbnail_url(body_md):
     return ''
 
 
-def generate_thumbnail(image_url, target_width=1280, target_height=720, quality=88):
-    """로컬 이미지 URL에서 16:9 WebP 썸네일을 생성하고 URL을 반환합니다.
-    외부 URL이거나 파일이 없으면 원본 URL을 그대로 반환합니다."""
-    if not image_url:
-        return ''
+def thumbnail_target(image_url):
+    """썸네일을 만들 수 있는 로컬 이미지면 (원본 경로, 썸네일 경로, 썸네일 URL)을, 아니면 None을 반환합니다.
 
-    # 외부 URL은 그대로 반환
-    if image_url.startswith(('http://', 'https://')):
-        return image_url
+    외부 URL, /media/ 밖의 경로, 없는 파일은 썸네일을 만들지 않습니다.
+    """
+    if not image_url or image_url.startswith(('http://', 'https://')):
+        return None
 
     # /media/로 시작하는 로컬 경로만 처리
     media_url = settings.MEDIA_URL  # '/media/'
     if not image_url.startswith(media_url):
-        return image_url
+        return None
 
     # 원본 파일의 실제 경로 계산
     relative_path = image_url[len(media_url):]
     source_path = Path(settings.MEDIA_ROOT) / relative_path
-
     if not source_path.is_file():
-        return image_url
+        return None
 
     # 썸네일 파일명: 원본 경로 기반 해시(기존 URL 규칙 유지)
     url_hash = hashlib.sha256(image_url.encode()).hexdigest()[:12]
     thumb_filename = f"thumb_{url_hash}.webp"
-    thumb_dir = Path(settings.MEDIA_ROOT) / 'thumbnails'
-    thumb_path = thumb_dir / thumb_filename
-    thumb_url = f"{media_url}thumbnails/{thumb_filename}"
+    thumb_path = Path(settings.MEDIA_ROOT) / 'thumbnails' / thumb_filename
+    return source_path, thumb_path, f"{media_url}thumbnails/{thumb_filename}"
 
-    # 이미 썸네일이 존재하면 재생성하지 않음
-    if thumb_path.is_file():
-        return thumb_url
 
-    try:
-        from PIL import Image
-        from PIL import ImageOps
-
-        thumb_dir.mkdir(parents=True, exist_ok=True)
+def create_thumbnail_file(source_path, thumb_path, target_width=1280, target_height=720, quality=88):
+    """원본 이미지를 16:9로 잘라 WebP 썸네일 파일을 만듭니다. 실패하면 예외를 그대로 발생시킵니다."""
+    from PIL import Image
+    from PIL import ImageOps
 
+    thumb_path.parent.mkdir(parents=True, exist_ok=True)
+    # 다른 워커가 읽는 도중의 반쯤 쓰인 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = thumb_path.with_name(f'.{thumb_path.name}.{uuid.uuid4().hex}.tmp')
+    try:
         with Image.open(source_path) as img:
             img = ImageOps.exif_transpose(img)
             thumb = ImageOps.fit(
@@ -100,11 +72,11 @@ def generate_thumbnail(image_url, target_width=1280, target_height=720, quality=
                 method=Image.Resampling.LANCZOS,
                 centering=(0.5, 0.5),
             )
-            thumb.save(thumb_path, format='WEBP', quality=quality, method=6)
-
-        return thumb_url
-    except Exception:
-        return image_url
+            thumb.save(tmp_path, format='WEBP', quality=quality, method=6)
+        os.replace(tmp_path, thumb_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
 
 
 def make_slug(title):
@@ -170,18 +142,31 @@ def normalize_tags(raw_tags):
 
 def parse_search_expression(raw_query):
     """`tag:` / `search:` 표현식을 파싱해 (tags, search_terms)를 반환합니다."""
+    tags, search_terms, _, _ = parse_search_query(raw_query)
+    return tags, search_terms
+
+
+def parse_search_query(raw_query):
+    """`tag:` / `search:` / `fuzzy:` 표현식을 파싱해 (tags, search_terms, fuzzy, required_tags)를 반환합니다.
+
+    `tag:` 구간의 태그는 하나라도 가진 글을 찾고(OR), `+`를 붙인 태그(`tag:docker,+aws`)는
+    결과를 좁히는 필수 태그로 모두 가진 글만 남깁니다(AND).
+    `fuzzy:` 구간은 `search:`와 같이 검색어로 모으되, 오타를 허용하는 유사 검색을 요청합니다.
+    """
     query = str(raw_query or '').strip()
     if not query:
-        return [], []
+        return [], [], False, []
 
-    marker_pattern = re.compile(r'(?i)\b(tag|search)\s*:')
+    marker_pattern = re.compile(r'(?i)\b(tag|search|fuzzy)\s*:')
     markers = list(marker_pattern.finditer(query))
     if not markers:
-        return [], [query]
+        return [], [query], False, []
 
     tags = []
+    required_tags = []
     search_terms = []
     seen_term = set()
+    fuzzy = False
 
     for idx, marker in enumerate(markers):
         kind = marker.group(1).lower()
@@ -194,35 +179,72 @@ def parse_search_expression(raw_query):
         if kind == 'tag':
             chunks = [item.strip() for item in section.split(',') if item.strip()]
             for chunk in chunks:
+                target = tags
+                if chunk.startswith('+'):
+                    target = required_tags
+                    chunk = chunk[1:]
                 parts = chunk.split(None, 1)
                 tag_candidate = normalize_tag(parts[0]) if parts else ''
-                if tag_candidate and tag_candidate not in tags:
-                    tags.append(tag_candidate)
+                if tag_candidate and tag_candidate not in target:
+                    target.append(tag_candidate)
                 if len(parts) > 1:
                     trailing = parts[1].strip()
                     if trailing and trailing not in seen_term:
                         seen_term.add(trailing)
                         search_terms.append(trailing)
         else:
+            if kind == 'fuzzy':
+                fuzzy = True
             for term in [item.strip() for item in section.split(',') if item.strip()]:
                 if term in seen_term:
                     continue
                 seen_term.add(term)
                 search_terms.append(term)
 
-    return tags, search_terms
+    return tags, search_terms, fuzzy, required_tags
 
 
-def build_search_expression(tags, search_terms):
+def build_search_expression(tags, search_terms, fuzzy=False, required_tags=()):
     """파싱 결과를 검색 입력용 문자열(`tag:... search:...`)로 조합합니다."""
     parts = []
-    if tags:
-        parts.append('tag:' + ','.join(tags))
+    tag_items = list(tags) + [f'+{tag}' for tag in required_tags]
+    if tag_items:
+        parts.append('tag:' + ','.join(tag_items))
     if search_terms:
-        parts.append('search:' + ','.join(search_terms))
+        parts.append(('fuzzy:' if fuzzy else 'search:') + ','.join(search_terms))
     return ' '.join(parts)
 
 
+# 한글(자모+음절) 연속 구간과, 한글을 제외한 단어 문자 연속 구간
+_HANGUL_CHARS = 'ㄱ-ㅎㅏ-ㅣ가-힣'
+_SEARCH_TOKEN_RE = re.compile(rf'[{_HANGUL_CHARS}]+|[^\W{_HANGUL_CHARS}]+')
+_HANGUL_RUN_RE = re.compile(rf'[{_HANGUL_CHARS}]+')
+
+
+def tokenize_search_text(text):
+    """검색 색인/질의용 토큰 목록을 만듭니다.
+
+    한글 구간은 두 글자씩 겹치는 bigram(`검색을` → `검색`, `색을`)으로 쪼개 조사가 붙은
+    단어도 어간으로 찾을 수 있게 하고, 그 밖의 단어는 소문자 단어 하나로 둡니다.
+    구간의 마지막 글자는 어떤 bigram의 시작도 아니므로 한 글자 토큰(`을`)을 덧붙여
+    한 글자 검색어(`책` → `동화책`)도 접두어 검색으로 찾을 수 있게 합니다.
+    """
+    tokens = []
+    for match in _SEARCH_TOKEN_RE.finditer(str(text or '').lower()):
+        run = match.group()
+        if len(run) > 1 and _HANGUL_RUN_RE.fullmatch(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def is_hangul_bigram(token):
+    """tokenize_search_text가 만든 한글 bigram 토큰인지 여부를 반환합니다."""
+    return len(token) == 2 and bool(_HANGUL_RUN_RE.fullmatch(token))
+
+
 def _parse_tags(raw_tags):
     """태그를 리스트로 변환합니다."""
     return normalize_tags(raw_tags)
@@ -7,46 +7,77 @@ from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
-from django.db import connection
-from django.db.models import Q
-from django.views.decorators.cache import never_cache
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, Q
+from django.views.decorators.cache import cache_control, never_cache
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import condition, require_GET, require_POST
 from datetime import timedelta
 
+from .conditional import post_detail_etag
+from .fragments import render_post_cards
 from .models import APIKey, Comment, Post
-from .tag_utils import get_sorted_tag_counts
+from .page_cache import (
+    PAGE_LIST_SURROGATE, PAGE_SEARCH_SURROGATE, add_page_surrogates, cache_anonymous_page,
+    comments_surrogate, post_surrogate, tag_surrogate,
+)
+from .pagination import get_count_strategy, make_paginator
+from .search_index import (
+    apply_fuzzy_search, build_fts_query, build_tsquery, get_cached_search_result,
+    suggest_titles, uses_postgres_search, uses_sqlite_fts,
+)
+from .tag_utils import (
+    TAG_CACHE_NAMESPACE, filter_posts_by_all_tags, filter_posts_by_tags, get_cached_tag_counts, get_related_tags,
+    get_tag_facets, suggest_tags,
+)
 from .utils import (
     make_slug, process_uploaded_md, process_uploaded_zip,
     build_search_expression, extract_frontmatter_and_body,
-    parse_search_expression, _parse_date, _parse_tags, normalize_tag,
-    extract_thumbnail_url, generate_thumbnail,
+    parse_search_query, _parse_date, _parse_tags, normalize_tag,
 )
 
 logger = logging.getLogger(__name__)
 
+TAG_SUGGEST_DEFAULT_LIMIT = 10
+TAG_SUGGEST_MAX_LIMIT = 500
+POST_SUGGEST_DEFAULT_LIMIT = 8
+POST_SUGGEST_MAX_LIMIT = 20
+SEARCH_DEGRADED_LIMIT = 200
+# 목록 카드에 필요한 컬럼만 읽음 — 본문 크기와 무관하게, 썸네일은 저장 시 만든 값을 사용
+# (updated_at은 카드 조각 캐시 키)
+POST_CARD_FIELDS = ('id', 'title', 'slug', 'summary', 'tags', 'thumbnail_url', 'created_at', 'updated_at')
+
 
-def _apply_text_search(posts_qs, search_terms):
+def _apply_text_search(posts_qs, search_terms, fuzzy=False):
     if not search_terms:
         return posts_qs
 
-    if connection.vendor == 'postgresql':
-        vector = SearchVector('search_document', config='simple')
-        query = None
-        for term in search_terms:
-            term_query = SearchQuery(term, config='simple', search_type='plain')
-            query = term_query if query is None else query & term_query
-
-        return (
-            posts_qs
-            .annotate(search_rank=SearchRank(vector, query))
-            .filter(search_rank__gt=0)
-            .order_by('-search_rank', '-created_at')
-        )
+    if fuzzy and uses_postgres_search():
+        return apply_fuzzy_search(posts_qs, search_terms)
+
+    if uses_postgres_search():
+        # 저장된 가중치 tsvector(GIN 색인)로 매칭/정렬해 질의 시점 토큰화를 피함
+        query, search_terms = build_tsquery(search_terms)
+        if query is not None:
+            posts_qs = (
+                posts_qs
+                .filter(search_vector=query)
+                .annotate(search_rank=SearchRank(F('search_vector'), query))
+                .order_by('-search_rank', '-created_at')
+            )
+    elif uses_sqlite_fts():
+        # FTS5 색인으로 매칭하고 bm25 점수(rank, 낮을수록 관련도 높음)로 정렬
+        match_query, search_terms = build_fts_query(search_terms)
+        if match_query:
+            posts_qs = (
+                posts_qs
+                .filter(search_index__search_tokens__match=match_query)
+                .annotate(search_rank=-F('search_index__rank'))
+                .order_by('-search_rank', '-created_at')
+            )
 
     for term in search_terms:
         posts_qs = posts_qs.filter(
@@ -57,30 +88,47 @@ def _apply_text_search(posts_qs, search_terms):
     return posts_qs
 
 
-def _apply_tag_search(posts_qs, valid_tags):
-    if not valid_tags:
-        return posts_qs
+def _apply_tag_search(posts_qs, valid_tags, required_tags=()):
+    # tag: 태그는 하나라도(OR), +태그는 모두(AND) 가진 글
+    return filter_posts_by_all_tags(filter_posts_by_tags(posts_qs, valid_tags), required_tags)
+
 
-    if connection.vendor == 'postgresql':
-        condition = Q()
-        for tag in valid_tags:
-            condition |= Q(tags__contains=[tag])
-        return posts_qs.filter(condition)
+def _search_post_ids(search_terms, valid_tags, fuzzy, required_tags=()):
+    """검색 결과를 (정렬된 게시글 id 목록, 유사 검색 대체 여부, 결과 내 태그 개수)로 반환합니다."""
+    fuzzy_fallback = False
+    posts = _apply_tag_search(
+        _apply_text_search(Post.objects.all(), search_terms, fuzzy), valid_tags, required_tags,
+    )
+    post_ids = list(posts.values_list('pk', flat=True))
+    # 전문 검색 결과가 없으면 오타일 가능성이 있으므로 trigram 유사 검색으로 한 번 더 찾음
+    if not post_ids and search_terms and not fuzzy and uses_postgres_search():
+        fuzzy_fallback = True
+        posts = _apply_tag_search(
+            _apply_text_search(Post.objects.all(), search_terms, True), valid_tags, required_tags,
+        )
+        post_ids = list(posts.values_list('pk', flat=True))
+    tag_facets = get_tag_facets(posts) if post_ids else []
+    return post_ids, fuzzy_fallback, tag_facets
 
-    return [
-        p for p in posts_qs
-        if any(tag in {normalize_tag(raw) for raw in p.tags} for tag in valid_tags)
-    ]
+
+def _title_search_post_ids(search_terms, valid_tags, required_tags=()):
+    """시간 예산을 넘긴 검색의 축소 경로: 제목만 찾아 최신순 id 일부를 반환합니다."""
+    posts = Post.objects.order_by('-created_at')
+    for term in search_terms:
+        posts = posts.filter(title__icontains=term)
+    posts = _apply_tag_search(posts, valid_tags, required_tags)
+    return list(posts.values_list('pk', flat=True)[:SEARCH_DEGRADED_LIMIT]), False, []
 
 
+@cache_anonymous_page
 def post_list(request):
     raw_query = request.GET.get('q', '').strip()
-    tags, search_terms = parse_search_expression(raw_query)
+    tags, search_terms, fuzzy, required_tags = parse_search_query(raw_query)
     extra_tag = normalize_tag(request.GET.get('tag', ''))
     if extra_tag and extra_tag not in tags:
         tags.append(extra_tag)
 
-    all_tags = get_sorted_tag_counts()
+    all_tags = get_cached_tag_counts()
     known_tags = {tag for tag, _ in all_tags}
     valid_tags = []
     for tag in tags:
@@ -89,6 +137,8 @@ def post_list(request):
                 valid_tags.append(tag)
         elif tag and tag not in search_terms:
             search_terms.append(tag)
+    # 없는 필수 태그는 결과를 비우는 대신 무시
+    required_tags = [tag for tag in required_tags if tag in known_tags]
 
     # 검색어 중 태그와 정확히 일치하는 항목은 태그로 승격
     filtered_search_terms = []
@@ -101,10 +151,6 @@ def post_list(request):
         filtered_search_terms.append(term)
     search_terms = filtered_search_terms
 
-    posts = Post.objects.all()
-    posts = _apply_text_search(posts, search_terms)
-    posts = _apply_tag_search(posts, valid_tags)
-
     per_page_options = [10, 20, 50, 100]
     try:
         per_page = int(request.GET.get('per_page', 10))
@@ -113,27 +159,119 @@ def post_list(request):
     if per_page not in per_page_options:
         per_page = 10
 
-    paginator = Paginator(posts, per_page)
+    query_expr = build_search_expression(valid_tags, search_terms, fuzzy, required_tags)
+    fuzzy_fallback = search_degraded = False
+    tag_facets = []
     page = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page)
-    for post in page_obj.object_list:
-        original_url = extract_thumbnail_url(post.body_md)
-        post.thumbnail_url = generate_thumbnail(original_url) if original_url else ''
+    if query_expr:
+        # 같은 검색식은 정렬된 id 목록을 재사용하고, 현재 페이지 행만 pk로 조회
+        ordering = 'relevance' if search_terms else 'recent'
+        result, search_degraded = get_cached_search_result(
+            query_expr, ordering,
+            lambda: _search_post_ids(search_terms, valid_tags, fuzzy, required_tags),
+            lambda: _title_search_post_ids(search_terms, valid_tags, required_tags),
+        )
+        post_ids, fuzzy_fallback, tag_facets = result or ([], False, [])
+        # 개수는 캐시된 id 목록 길이라 COUNT 질의가 없으므로 개수 전략을 쓰지 않음
+        page_obj = Paginator(post_ids, per_page).get_page(page)
+        posts_by_id = Post.objects.only(*POST_CARD_FIELDS).in_bulk(page_obj.object_list)
+        page_obj.object_list = [posts_by_id[pk] for pk in page_obj.object_list if pk in posts_by_id]
+    else:
+        paginator = make_paginator(
+            Post.objects.only(*POST_CARD_FIELDS), per_page,
+            get_count_strategy('post_list'), count_key=('all',),
+        )
+        page_obj = paginator.get_page(page)
+
+    # 축소 응답은 캐시하지 않고, 나머지는 보여준 글과 거른 태그에 의존하도록 등록
+    if not search_degraded:
+        add_page_surrogates(
+            request, PAGE_LIST_SURROGATE, TAG_CACHE_NAMESPACE,
+            *(post_surrogate(post.pk) for post in page_obj),
+            *(tag_surrogate(tag) for tag in valid_tags + required_tags),
+        )
+        if search_terms:
+            add_page_surrogates(request, PAGE_SEARCH_SURROGATE)
 
     return render(request, 'blog/post_list.html', {
         'page_obj': page_obj,
+        'post_cards': render_post_cards(page_obj, {
+            'is_staff': request.user.is_staff,
+            'current_query_expr': query_expr,
+            'per_page': per_page,
+        }),
         'all_tags': all_tags,
         'current_tags': valid_tags,
+        'current_required_tags': required_tags,
+        # 관련 태그도 현재 조건에 필수 태그로 더해 결과를 좁힘
+        'related_tags': [
+            {
+                'tag': tag, 'count': count,
+                'query_expr': build_search_expression(valid_tags, search_terms, fuzzy, required_tags + [tag]),
+            }
+            for tag, count in get_related_tags(valid_tags + required_tags)
+        ],
+        # 결과 내 태그는 현재 조건에 필수 태그로 더해 좁히므로 개수와 링크 결과가 같음
+        'tag_facets': [
+            {
+                'tag': tag, 'count': count,
+                'query_expr': build_search_expression(valid_tags, search_terms, fuzzy, required_tags + [tag]),
+            }
+            for tag, count in tag_facets
+            if tag not in valid_tags and tag not in required_tags
+        ],
         'current_search_terms': search_terms,
-        'current_query_expr': build_search_expression(valid_tags, search_terms),
+        'current_query_expr': query_expr,
+        'search_fuzzy': fuzzy or fuzzy_fallback,
+        'search_fuzzy_fallback': fuzzy_fallback,
+        'search_degraded': search_degraded,
         'per_page': per_page,
         'per_page_options': per_page_options,
     })
 
 
+@require_GET
+def tag_suggest(request):
+    """태그 자동완성: 접두어(q)로 시작하는 태그를 빈도 내림차순으로 반환합니다."""
+    try:
+        limit = int(request.GET.get('limit', TAG_SUGGEST_DEFAULT_LIMIT))
+    except (ValueError, TypeError):
+        limit = TAG_SUGGEST_DEFAULT_LIMIT
+    limit = min(TAG_SUGGEST_MAX_LIMIT, max(1, limit))
+
+    tag_items = suggest_tags(request.GET.get('q', ''), limit)
+    return JsonResponse({
+        'tags': [{'tag': tag, 'count': count} for tag, count in tag_items],
+    })
+
+
+@require_GET
+def post_suggest(request):
+    """제목 자동완성: 제목의 단어가 접두어(q)로 시작하는 글을 최신순으로 반환합니다."""
+    from django.urls import reverse
+    try:
+        limit = int(request.GET.get('limit', POST_SUGGEST_DEFAULT_LIMIT))
+    except (ValueError, TypeError):
+        limit = POST_SUGGEST_DEFAULT_LIMIT
+    limit = min(POST_SUGGEST_MAX_LIMIT, max(1, limit))
+
+    posts = suggest_titles(request.GET.get('q', ''), limit)
+    return JsonResponse({
+        'posts': [
+            {'title': title, 'slug': slug, 'url': reverse('blog:post_detail', args=[slug])}
+            for _, title, slug in posts
+        ],
+    })
+
+
+# Last-Modified는 사용자/내비게이션 태그 변경을 담지 못해 ETag만 씀
+@cache_control(no_cache=True)
+@condition(etag_func=post_detail_etag)
+@cache_anonymous_page
 def post_detail(request, slug):
     post = get_object_or_404(Post, slug=slug)
     comments = post.comments.select_related('user')
+    add_page_surrogates(request, post_surrogate(post.pk), comments_surrogate(post.pk), TAG_CACHE_NAMESPACE)
     return render(request, 'blog/post_detail.html', {
         'post': post,
         'comments': comments,
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'allauth',
     'allauth.account',
     'allauth.socialaccount',
@@ -48,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 비로그인 페이지 캐시 저장 — 다른 미들웨어가 붙인 쿠키까지 보도록 맨 앞에 둠
+    'blog.page_cache.PageCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -97,6 +101,45 @@ DATABASES = {
 }
 
 
+# Cache
+# 태그/검색/페이지 캐시의 무효화는 공유 캐시의 세대 번호에 의존하므로 워커 간 공유 백엔드가 필요
+# 기본은 DB 캐시 (`python manage.py createcachetable`로 테이블 생성)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'blog_cache'),
+    }
+}
+
+# 프로세스별 캐시로는 다른 워커가 무효화를 보지 못해 오래된 페이지/304를 응답함
+if not DEBUG and CACHES['default']['BACKEND'].endswith(('.LocMemCache', '.DummyCache')):
+    raise ImproperlyConfigured('DEBUG=False에서는 워커 간 공유 캐시 백엔드(CACHE_BACKEND)가 필요합니다.')
+
+# 비로그인 글 목록/상세 페이지 전체 응답 캐시 시간(초) — 글/댓글 변경 시 해당 페이지만 무효화 (0이면 끔)
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', '300'))
+
+
+# Search
+# 유사(오타 허용) 검색의 pg_trgm 단어 유사도 임계값 — 낮출수록 더 느슨하게 매칭
+
+SEARCH_FUZZY_THRESHOLD = float(os.environ.get('SEARCH_FUZZY_THRESHOLD', '0.4'))
+
+# 검색 질의 시간 예산(ms) — 넘기면 직전 결과나 제목 검색으로 축소 응답 (0이면 제한 없음)
+SEARCH_QUERY_TIMEOUT_MS = int(os.environ.get('SEARCH_QUERY_TIMEOUT_MS', '1500'))
+
+
+# Pagination
+# 뷰별 전체 개수 계산 전략: exact(매번 COUNT), cached(쓰기 시 무효화되는 캐시 개수),
+# estimated(PostgreSQL 계획기 추정치), has_next(COUNT 없이 다음 페이지 여부만)
+# post_list는 필터 없는 목록에만 적용 — 태그/검색 목록은 캐시된 id 목록 길이(정확한 개수)를 씀
+
+PAGINATION_COUNT_STRATEGIES = {
+    'post_list': 'cached',
+    'api_post_list': 'cached',
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 